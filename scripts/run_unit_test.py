@@ -16,33 +16,126 @@ To ensure proper test discovery and import resolution with `unittest`:
 3. Every folder under "tests" that contains test modules must include an `__init__.py` file.
    - This allows the folder to be treated as a proper Python package.
    - Without these files, `unittest` may fail to import and run the test modules.
+
+A run in this process uses pytest with `--import-mode=importlib` when pytest is installed, and `unittest`
+otherwise. A parallel run always uses `unittest`, with one test module at a time in each worker process, even
+when pytest is installed.
+
+USAGE:
+    python scripts/run_unit_test.py      # run all tests in this process
+    python scripts/run_unit_test.py 4    # run test modules with unittest in 4 parallel worker processes
 """
 
 
+import contextlib
+import io
 import os
-import subprocess
 import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+# Repository root, so "src" imports resolve the same way as when tests are run from the repository root
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+# Folder with all unit tests
+TESTS_DIR = os.path.join(REPO_ROOT, 'tests')
+
+
+def get_test_names(suite):
+    # Flatten a discovered test suite to a list of test cases
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from get_test_names(test)
+        else:
+            yield test
+
+
+def run_test_module(module_name):
+    # Run all tests of one test module and capture its output so parallel runs do not interleave
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    if TESTS_DIR not in sys.path:
+        sys.path.insert(0, TESTS_DIR)
+
+    stream = io.StringIO()
+    with contextlib.redirect_stdout(stream):
+        suite = unittest.TestLoader().loadTestsFromName(module_name)
+        result = unittest.TextTestRunner(stream=stream, verbosity=1).run(suite)
+    return stream.getvalue(), result.wasSuccessful()
+
+
+def run_tests_with_pytest():
+    # Run all tests with pytest when it is installed. Returns None when pytest is not installed
+    try:
+        import pytest
+    except ImportError:
+        return None
+
+    # importlib import mode collects test modules without walking "__init__.py" package markers and the cache
+    # provider is not needed for a single run
+    exit_code = pytest.main(['--import-mode=importlib', '-p', 'no:cacheprovider', '-q', TESTS_DIR])
+    return exit_code == 0
+
+
+def run_tests_with_unittest(jobs):
+    # Discover tests once in this process
+    loader = unittest.TestLoader()
+    suite = loader.discover(TESTS_DIR, pattern='test_*.py')
+    if loader.errors:
+        for error in loader.errors:
+            print(error)
+        return False
+
+    if jobs > 1:
+        # Run test modules in parallel worker processes. Each worker imports the test dependencies again, so
+        # this only pays off once the test suite takes longer than starting the workers
+        module_names = sorted({test.__class__.__module__ for test in get_test_names(suite)})
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(run_test_module, module_names))
+        # Show output in module order
+        all_passed = True
+        for module_name, (output, passed) in zip(module_names, results):
+            print(f"*** {module_name} ***")
+            print(output)
+            all_passed = all_passed and passed
+        return all_passed
+
+    # Run all tests in this process
+    return unittest.TextTestRunner().run(suite).wasSuccessful()
+
 
 # Function to run the tests
-def run_tests():
+def run_tests(jobs=1):
     print()
     print("Running unit tests...")
     try:
-        # Get the absolute path to the tests directory
-        tests_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests')
+        if REPO_ROOT not in sys.path:
+            sys.path.insert(0, REPO_ROOT)
+
+        # pytest is preferred when installed, unittest is always available. Parallel runs always use unittest
+        all_passed = None
+        if jobs <= 1:
+            all_passed = run_tests_with_pytest()
+        if all_passed is None:
+            all_passed = run_tests_with_unittest(jobs)
 
-        # Run unittest and capture output
-        result = subprocess.run([sys.executable, '-m', 'unittest', 'discover', '-s', tests_dir, '-p', 'test_*.py'])
-        if result.returncode == 0:
+        if all_passed:
             print("Unit test passed.")
             return 0  # Indicate success
         else:
             print("Unit tests FAILED.")
             return 1  # Indicate failure
-    except subprocess.CalledProcessError as e:
+    except Exception as e:
         print(f"ERROR during unit test: {e}")
-        return e.returncode
+        return 1  # Indicate failure
+
 
 if __name__ == "__main__":
-    if run_tests() != 0:
+    # Optional number of parallel worker processes, e.g. "python scripts/run_unit_test.py 4"
+    try:
+        worker_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    except ValueError:
+        print(f'Invalid number of worker processes "{sys.argv[1]}".')
+        print("Usage: python scripts/run_unit_test.py [number of parallel worker processes]")
+        sys.exit(2)
+    if run_tests(worker_count) != 0:
         sys.exit(1)
@@ -1,30 +1,150 @@
+import contextlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Optional
+
 import paths
 import files
 import strings
 import frames
-from src.enumeration import SourceFileType, OutputFileType, BomTempVer
+from src.enumeration import SourceFileType, OutputFileType, BomTempVer, OutputFileFormat
 
 
-def sequence_cbom_for_cost_walk() -> None:
+def check_designators(df):
+    # check for duplicate reference designators
+    strings.check_duplicate_ref_des(df)
+    # check qty matches reference designator count
+    frames.check_qty_matched_ref_des_count(df)
 
-    source_file_type = SourceFileType.CB
-    output_file_type = OutputFileType.CW
+    return df
+
+
+def get_db_upload_steps(drop_unwanted_items, drop_unwanted_components, drop_unwanted_ebom_rows: bool) -> list:
+    """
+    Get the steps to clean up BOM data for database upload.
+
+    cBOM and eBOM database upload only differ in which items are unwanted, so both use the same list of steps.
+
+    Args:
+        drop_unwanted_items (Callable): Step to remove empty designator, less than one quantity and unwanted
+            description items.
+        drop_unwanted_components (Callable): Step to remove unwanted component type items.
+        drop_unwanted_ebom_rows (bool): When True, also remove rows that have unwanted eBOM items after the designator
+            checks.
+
+    Returns:
+        list: Steps that take the BOM data, BOM template version and source file type and return the updated BOM data.
+    """
+    steps = [
+        # fill empty cells with data from above cell.
+        lambda df, ver, src: frames.fill_empty_cell_with_data_from_above_cell(df),
+        # fill empty cells with data using alternative of the same components
+        lambda df, ver, src: frames.fill_empty_cell_using_data_from_above_alternative(df),
+        # replace alternative with data
+        lambda df, ver, src: frames.replace_alternative_label_with_data_from_above_alternative(df),
+
+        # fill in designators when designator cells are merged (eBOM)
+        # lambda df, ver, src: frames.fill_merged_designators(df, ver, BomTempVer),
+
+        # primary component should be first
+        lambda df, ver, src: frames.primary_above_alternative(df, ver, BomTempVer),
+        # merge alternative components to one row
+        lambda df, ver, src: frames.merge_alternative(df),
+
+        # clean up description column data
+        lambda df, ver, src: frames.cleanup_description(df),
+        # remove empty designator, less than one quantity and unwanted description items before the slow component
+        # type label normalization
+        lambda df, ver, src: drop_unwanted_items(df),
+
+        # normalize component type labels
+        lambda df, ver, src: frames.normalize_component_type_label(df),
+        # remove rows that have unwanted component type items
+        lambda df, ver, src: drop_unwanted_components(df),
+
+        # remove unwanted characters from designators
+        lambda df, ver, src: frames.cleanup_designators(df),
+        # check reference designator format
+        lambda df, ver, src: strings.check_ref_des_name(df),
+        # check for duplicate reference designators and qty matches reference designator count
+        lambda df, ver, src: check_designators(df),
+    ]
+
+    if drop_unwanted_ebom_rows:
+        # remove rows that have unwanted items
+        steps.append(lambda df, ver, src: frames.drop_rows_with_unwanted_ebom_items(df))
+
+    steps += [
+        # separate manufacturers to separate rows
+        lambda df, ver, src: frames.split_manufacturers_to_separate_rows(
+            df, ver, BomTempVer, src, SourceFileType),
+        # clean up manufacturer name
+        lambda df, ver, src: frames.cleanup_manufacturer(df),
+
+        # clean up part number
+        lambda df, ver, src: frames.cleanup_part_number(df),
+
+        # add type information to description. Note do this before removing P/N from description or nan cell causes
+        # issue
+        # lambda df, ver, src: frames.merge_type_data_with_description(df, ver),
+        # remove part number from description
+        # lambda df, ver, src: frames.remove_part_number_from_description(df),
+    ]
+
+    return steps
+
+
+# Steps to clean up BOM data for each output file type. The steps run in order after the BOM table is extracted from
+# the source file. Each step gets the BOM data (df), the BOM template version (ver) and the source file type (src) and
+# returns the updated BOM data.
+sequence_steps = {
+    # cBOM for cost walk
+    OutputFileType.CW: [
+        # primary component should be first
+        lambda df, ver, src: frames.primary_above_alternative(df, ver, BomTempVer),
+        # merge alternative components to one row
+        lambda df, ver, src: frames.merge_alternative(df),
+
+        # remove zero quantity data
+        lambda df, ver, src: frames.drop_item_with_zero_quantity(df),
+        # remove unwanted characters from designators
+        lambda df, ver, src: frames.cleanup_designators(df),
+        # split multiple quantity to separate rows
+        lambda df, ver, src: frames.split_multiple_quantity(df),
+    ],
+    # cBOM for database upload
+    OutputFileType.dB_CB: get_db_upload_steps(frames.drop_unwanted_db_cbom_items,
+                                               frames.drop_unwanted_db_cbom_component,
+                                               drop_unwanted_ebom_rows=False),
+    # eBOM for database upload
+    OutputFileType.db_EB: get_db_upload_steps(frames.drop_unwanted_db_ebom_items,
+                                               frames.drop_unwanted_db_ebom_component,
+                                               drop_unwanted_ebom_rows=True),
+}
+
+
+def run_sequence(source_file_type: SourceFileType,
+                 output_file_type: OutputFileType,
+                 file_name: Optional[str] = None,
+                 output_file_format: OutputFileFormat = OutputFileFormat.XLSX,
+                 sheet_name: Optional[str] = None,
+                 build_name: Optional[str] = None) -> None:
 
     # *** read Excel data file ***
     # get path to input data folder
     folder_path = paths.get_path_to_input_file_folder()
-    # get Excel file name to process
-    file_name = paths.get_selected_excel_file_name(folder_path)
-    # read excel file data
-    excel_data = files.read_raw_excel_file_data(folder_path, file_name)
-
-    # *** Extract cbom sheet to process ***
-    # extract user selected Excel file sheet
-    df = files.get_user_selected_excel_file_sheet(excel_data)
-    # only keep cost data for build on interest
-    df = frames.select_build(df)
-
-    # *** Extract cbom table ***
+    # get Excel file name to process when the caller did not provide one
+    if file_name is None:
+        file_name = paths.get_selected_excel_file_name(folder_path)
+
+    # *** Extract sheet to process ***
+    # extract user selected Excel file sheet. The user is only asked when the caller did not select a sheet
+    df = files.read_user_selected_excel_file_sheet(folder_path, file_name, sheet_name)
+    # only keep cost data for build on interest. The user is only asked when the caller did not select a build
+    df = frames.select_build(df, build_name)
+
+    # *** Extract bom table ***
     # drop rows above BOM header and set top row as header
     df = frames.search_and_set_bom_header(df)
     # determine version of BOM template as it will determine how BOM cleanup will happen
@@ -35,238 +155,136 @@ def sequence_cbom_for_cost_walk() -> None:
     df = frames.get_bom_columns(df, source_bom_header)
 
     # delete empty rows and columns
-    df = frames.delete_empty_rows(df)
-    df = frames.delete_empty_columns(df)
-    # set datatype for columns
-    df = frames.set_bom_column_datatype(df)
-    # primary component should be first
-    df = frames.primary_above_alternative(df, bom_temp_ver, BomTempVer)
-    # merge alternative components to one row
-    df = frames.merge_alternative(df)
-
-    # *** Clean up data ***
-    # remove zero quantity data
-    df = frames.drop_item_with_zero_quantity(df)
-    # remove unwanted characters from designators
-    df = frames.cleanup_designators(df)
-    # split multiple quantity to separate rows
-    df = frames.split_multiple_quantity(df)
-
-    # *** write cBOM data to file ***
+    df = frames.delete_empty_rows_and_columns(df)
     # get output BOM header labels as they are different depending upon BOM template version and output file format
     output_bom_header = frames.get_output_bom_header_labels(bom_temp_ver, BomTempVer, output_file_type, OutputFileType)
-    # keep only the columns needed based on cBOM cost walk
-    df = frames.get_bom_columns(df, output_bom_header)
+    # keep only the columns needed for the output file type, in output order, so the clean up steps do not process
+    # columns that are not written. Source header labels are already standardized, so columns are selected by name
+    df = df[output_bom_header]
+    # set datatype for columns
+    df = frames.set_bom_column_datatype(df)
+
+    # *** Clean up bom data ***
+    for step in sequence_steps[output_file_type]:
+        df = step(df, bom_temp_ver, source_file_type)
+
+    # *** write bom data to file ***
     # get path to output data folder
     folder_path = paths.get_path_to_outputs_folder()
-    # Set Excel file name
-    file_name = OutputFileType.CW.value + file_name
-    # write Excel file data
-    files.write_single_sheet_excel_file_data(folder_path, file_name, df)
+    # Set output file name
+    file_name = output_file_type.value + file_name
+    # write file data
+    files.write_single_sheet_file_data(folder_path, file_name, df, output_file_format)
 
     return None
 
 
-def sequence_cbom_for_db_upload() -> None:
-
-    source_file_type = SourceFileType.CB
-    output_file_type = OutputFileType.dB_CB
-
-    # *** read cBOM Excel data file ***
-    # get path to input data folder
-    folder_path = paths.get_path_to_input_file_folder()
-    # get Excel file name to process
-    file_name = paths.get_selected_excel_file_name(folder_path)
-    # read excel file data
-    excel_data = files.read_raw_excel_file_data(folder_path, file_name)
-
-    # *** Extract sheet to process ***
-    df = files.get_user_selected_excel_file_sheet(excel_data)
-    # only keep cost data for build on interest
-    df = frames.select_build(df)
-
-    # *** Extract cbom data ***
-    # drop rows above BOM header and set top row as header
-    df = frames.search_and_set_bom_header(df)
-    # determine version of BOM template as it will determine how BOM cleanup will happen
-    bom_temp_ver = frames.get_bom_template_version(df, BomTempVer)
-    # get source BOM header labels as they are different depending upon BOM template version and source BOM type
-    source_bom_header = frames.get_source_bom_header_labels(bom_temp_ver, BomTempVer, source_file_type, SourceFileType)
-    # extract columns from source data
-    df = frames.get_bom_columns(df, source_bom_header)
-    # delete empty rows and columns
-    df = frames.delete_empty_rows(df)
-    df = frames.delete_empty_columns(df)
-    # set datatype for columns
-    df = frames.set_bom_column_datatype(df)
-
-    # fill empty cells with data from above cell.
-    df = frames.fill_empty_cell_with_data_from_above_cell(df)
-    # fill empty cells with data using alternative of the same components
-    df = frames.fill_empty_cell_using_data_from_above_alternative(df)
-    # replace alternative with data
-    df = frames.replace_alternative_label_with_data_from_above_alternative(df)
-
-    # primary component should be first
-    df = frames.primary_above_alternative(df, bom_temp_ver, BomTempVer)
-    # merge alternative components to one row
-    df = frames.merge_alternative(df)
-
-    # *** Clean up cbom data ***
-    # remove empty designator data
-    df = frames.drop_items_with_empty_designator(df)
-    # remove zero quantity data
-    df = frames.drop_item_with_zero_quantity(df)
-    # remove less than one quantity
-    df = frames.drop_item_with_quantity_less_than_one(df)
-
-    # clean up description column data
-    df = frames.cleanup_description(df)
-    # remove rows that have unwanted description items
-    df = frames.drop_unwanted_db_cbom_description(df)
-
-    # normalize component type labels
-    df = frames.normalize_component_type_label(df)
-    # remove rows that have unwanted component type items
-    df = frames.drop_unwanted_db_cbom_component(df)
-
-    # remove unwanted characters from designators
-    df = frames.cleanup_designators(df)
-    # check reference designator format
-    df = strings.check_ref_des_name(df)
-    # check for duplicate reference designators
-    strings.check_duplicate_ref_des(df)
-    # check qty matches reference designator count
-    frames.check_qty_matched_ref_des_count(df)
-
-    # separate manufacturers to separate rows
-    df = frames.split_manufacturers_to_separate_rows(df, bom_temp_ver, BomTempVer, source_file_type, SourceFileType)
-    # clean up manufacturer name
-    df = frames.cleanup_manufacturer(df)
+def sequence_cbom_for_cost_walk(file_name: Optional[str] = None,
+                                output_file_format: OutputFileFormat = OutputFileFormat.XLSX) -> None:
+    run_sequence(SourceFileType.CB, OutputFileType.CW, file_name, output_file_format)
 
-    # clean up part number
-    df = frames.cleanup_part_number(df)
 
-    # add type information to description. Note do this before removing P/N from description or nan cell causes issue
-    # df = frames.merge_type_data_with_description(df, bom_temp_ver)
-    # remove part number from description
-    # df = frames.remove_part_number_from_description(df)
+def sequence_cbom_for_db_upload(file_name: Optional[str] = None,
+                                output_file_format: OutputFileFormat = OutputFileFormat.XLSX) -> None:
+    run_sequence(SourceFileType.CB, OutputFileType.dB_CB, file_name, output_file_format)
 
-    # *** write scrubbed cBOM data to file ***
-    # get output BOM header labels as they are different depending upon BOM template version and output file format
-    output_bom_header = frames.get_output_bom_header_labels(bom_temp_ver, BomTempVer, output_file_type, OutputFileType)
-    # keep only the columns needed based on cBOM upload to dB
-    df = frames.get_bom_columns(df, output_bom_header)
-    # get path to output data folder
-    folder_path = paths.get_path_to_outputs_folder()
-    # Set Excel file name
-    file_name = OutputFileType.dB_CB.value + file_name
-    # write Excel file data
-    files.write_single_sheet_excel_file_data(folder_path, file_name, df)
 
-    return None
+def sequence_ebom_for_db_upload(file_name: Optional[str] = None,
+                                output_file_format: OutputFileFormat = OutputFileFormat.XLSX) -> None:
+    run_sequence(SourceFileType.EB, OutputFileType.db_EB, file_name, output_file_format)
 
 
-def sequence_ebom_for_db_upload():
+# Source and output file types of each sequence, in main menu order
+sequence_file_types = [
+    (SourceFileType.CB, OutputFileType.CW),
+    (SourceFileType.CB, OutputFileType.dB_CB),
+    (SourceFileType.EB, OutputFileType.db_EB),
+]
 
-    source_file_type = SourceFileType.EB
-    output_file_type = OutputFileType.db_EB
 
-    # *** read Excel data file ***
-    # get path to input data folder
-    folder_path = paths.get_path_to_input_file_folder()
-    # get Excel file name to process
-    file_name = paths.get_selected_excel_file_name(folder_path)
-    # read excel file data
-    excel_data = files.read_raw_excel_file_data(folder_path, file_name)
+def get_user_selected_sheet_and_build(folder_path: str, file_name: str) -> tuple[str, str]:
+    # user interface message
+    print()
+    print(f'Selecting sheet and build for "{file_name}"... ')
 
-    # *** Extract cbom sheet to process ***
-    df = files.get_user_selected_excel_file_sheet(excel_data)
-    # only keep cost data for build on interest
-    df = frames.select_build(df)
+    # get user to select the sheet to process
+    sheet_name = files.get_user_selected_excel_file_sheet_name(folder_path, file_name)
 
-    # *** Extract ebom table ***
-    # drop rows above BOM header and set top row as header
-    df = frames.search_and_set_bom_header(df)
-    # determine version of BOM template as it will determine how BOM cleanup will happen
-    bom_temp_ver = frames.get_bom_template_version(df, BomTempVer)
-    # get source BOM header labels as they are different depending upon BOM template version and source BOM type
-    source_bom_header = frames.get_source_bom_header_labels(bom_temp_ver, BomTempVer, source_file_type, SourceFileType)
-    df = frames.get_bom_columns(df, source_bom_header)
-    # delete empty rows and columns
-    df = frames.delete_empty_rows(df)
-    df = frames.delete_empty_columns(df)
-    # set datatype for columns
-    df = frames.set_bom_column_datatype(df)
+    # build names are found in the top row of the sheet, so only that row is read here. The whole sheet is read by the
+    # worker that processes the file. Read messages are not shown, as they are shown again when the file is processed
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = files.read_excel_file_sheet_top_rows(folder_path, file_name, sheet_name, 1)
+    # get user to select the build to process
+    build_name = frames.get_selected_build_name(df)
 
-    # fill empty cells with data from above cell.
-    df = frames.fill_empty_cell_with_data_from_above_cell(df)
-    # fill empty cells with data using alternative of the same components
-    df = frames.fill_empty_cell_using_data_from_above_alternative(df)
-    # replace alternative with data
-    df = frames.replace_alternative_label_with_data_from_above_alternative(df)
-
-    # fill in designators when designator cells are merged
-    # df = frames.fill_merged_designators(df, bom_temp_ver, BomTempVer)
-
-    # primary component should be first
-    df = frames.primary_above_alternative(df, bom_temp_ver, BomTempVer)
-    # merge alternative components to one row
-    df = frames.merge_alternative(df)
-
-    # *** Clean up ebom table ***
-    # remove empty designator data
-    df = frames.drop_items_with_empty_designator(df)
-    # remove zero quantity data
-    df = frames.drop_item_with_zero_quantity(df)
-    # remove less than one quantity
-    df = frames.drop_item_with_quantity_less_than_one(df)
-
-    # clean up description column data
-    df = frames.cleanup_description(df)
-    # remove rows that have unwanted description items
-    df = frames.drop_unwanted_db_ebom_description(df)
-
-    # normalize component type labels
-    df = frames.normalize_component_type_label(df)
-    # remove rows that have unwanted component type items
-    df = frames.drop_unwanted_db_ebom_component(df)
-
-    # remove unwanted characters from designators
-    df = frames.cleanup_designators(df)
-    # check reference designator format
-    df = strings.check_ref_des_name(df)
-    # check for duplicate reference designators
-    strings.check_duplicate_ref_des(df)
-    # check qty matches reference designator count
-    frames.check_qty_matched_ref_des_count(df)
+    return sheet_name, build_name
 
-    # remove rows that have unwanted items
-    df = frames.drop_rows_with_unwanted_ebom_items(df)
 
-    # separate manufacturers to separate rows
-    df = frames.split_manufacturers_to_separate_rows(df, bom_temp_ver, BomTempVer, source_file_type, SourceFileType)
-    # clean up manufacturer name
-    df = frames.cleanup_manufacturer(df)
+def run_sequence_in_worker(source_file_type: SourceFileType,
+                           output_file_type: OutputFileType,
+                           file_name: str,
+                           output_file_format: OutputFileFormat,
+                           sheet_name: str,
+                           build_name: str) -> tuple[str, Optional[str]]:
+    # Run the sequence for one file and capture its output so parallel runs do not interleave. A worker process can
+    # not prompt the user, so the sheet and build are selected before the file is given to a worker
+    stream = io.StringIO()
+    error = None
+    with contextlib.redirect_stdout(stream):
+        try:
+            run_sequence(source_file_type, output_file_type, file_name, output_file_format, sheet_name, build_name)
+        except (Exception, SystemExit) as e:
+            # a console prompt can still exit the application, which must not end the worker process
+            error = f"{type(e).__name__}: {e}"
+    return stream.getvalue(), error
 
-    # clean up part number
-    df = frames.cleanup_part_number(df)
 
-    # add type information to description. Note do this before removing P/N from description or nan cell causes issue
-    # df = frames.merge_type_data_with_description(df, bom_temp_ver)
-    # remove part number from description
-    # df = frames.remove_part_number_from_description(df)
+def run_sequence_for_all_files(source_file_type: SourceFileType,
+                               output_file_type: OutputFileType,
+                               output_file_format: OutputFileFormat = OutputFileFormat.XLSX,
+                               max_workers: Optional[int] = None) -> None:
 
-    # *** write eBOM data to file ***
-    # get output BOM header labels as they are different depending upon BOM template version and output file format
-    output_bom_header = frames.get_output_bom_header_labels(bom_temp_ver, BomTempVer, output_file_type, OutputFileType)
-    # keep only the columns needed based on eBOM upload to dB
-    df = frames.get_bom_columns(df, output_bom_header)
-    # get path to output data folder
-    folder_path = paths.get_path_to_outputs_folder()
-    # Set Excel file name
-    file_name = OutputFileType.db_EB.value + file_name
-    # write Excel file data
-    files.write_single_sheet_excel_file_data(folder_path, file_name, df)
+    # user interface message
+    print()
+    print('Processing all excel files in input folder... ')
 
-    return None
+    # get all Excel files in the input data folder. os.listdir order is arbitrary, so sort the names to always process
+    # and show the files in the same order
+    folder_path = paths.get_path_to_input_file_folder()
+    file_names = sorted(paths.get_excel_file_names(folder_path))
+
+    # A worker process can not prompt the user, so get the user to select the sheet and build of every file first.
+    # A file that can not be read is reported as failed and not processed
+    results = {}
+    selections = {}
+    for file_name in file_names:
+        try:
+            selections[file_name] = get_user_selected_sheet_and_build(folder_path, file_name)
+        except Exception as e:
+            results[file_name] = ('', f"{type(e).__name__}: {e}")
+
+    selected_file_names = list(selections)
+    sheet_names = [selections[file_name][0] for file_name in selected_file_names]
+    build_names = [selections[file_name][1] for file_name in selected_file_names]
+
+    # Files are independent, so process them in parallel worker processes. By default one worker per CPU is used
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        worker_results = executor.map(run_sequence_in_worker, repeat(source_file_type), repeat(output_file_type),
+                                      selected_file_names, repeat(output_file_format), sheet_names, build_names)
+        results.update(zip(selected_file_names, worker_results))
+
+    # Show output in file order
+    failed_count = 0
+    for file_name in file_names:
+        output, error = results[file_name]
+        print()
+        print(f'*** {file_name} ***')
+        print(output)
+        if error is not None:
+            print('*** ERROR ***')
+            print(f'Processing of "{file_name}" FAILED. {error}')
+            failed_count += 1
+
+    # user interface message
+    print()
+    print(f'{len(file_names) - failed_count} of {len(file_names)} files processed successfully.')
@@ -1,3 +1,5 @@
+import functools
+
 import pandas as pd
 
 
@@ -18,17 +20,28 @@ def get_single_header_index(df, reference_string, full_match=True):
     Raises:
     - ValueError: If no header matches the reference string or if more than one header matches.
     """
-    # Get a list of header indices that match the string
-    matched_headers_list = []
-    for header_index, header_name in enumerate(list(df.columns)):
-        if full_match:
-            # compare is case-insensitive
-            if reference_string.lower() == header_name.lower():
-                matched_headers_list.append(header_index)
-        else:
-            # compare is case-insensitive
-            if reference_string.lower() in header_name.lower():
-                matched_headers_list.append(header_index)
+    return get_single_header_index_in_list(list(df.columns), reference_string, full_match)
+
+
+def get_single_header_index_in_list(header_list, reference_string, full_match=True):
+    """
+    Retrieve the index of a single header in a list of header names based on a reference string.
+    Search is case-insensitive
+
+    Parameters:
+    - header_list (list): The header names.
+    - reference_string (str): The string to match against the header names.
+    - full_match (bool): If True, perform a full string match against the header names.
+                          If False, allow partial matches.
+
+    Returns:
+    - header_index (int): The index of the matched header.
+
+    Raises:
+    - ValueError: If no header matches the reference string or if more than one header matches.
+    """
+    # Get the header indices that match the string. Compare is case-insensitive
+    matched_headers_list = get_matched_header_indices(tuple(header_list), reference_string, full_match, False)
 
     # We only expect one match
     if len(matched_headers_list) == 1:
@@ -43,23 +56,75 @@ def get_single_header_index(df, reference_string, full_match=True):
     return header_index
 
 
+def get_header_indices(df, reference_string, full_match=True, case_sensitive=True):
+    """
+    Retrieve the indices of all headers in the DataFrame that match a reference string.
+
+    Parameters:
+    - df (DataFrame): The pandas DataFrame containing the headers.
+    - reference_string (str): The string to match against the column headers.
+    - full_match (bool): If True, perform a full string match against the header names.
+                          If False, allow partial matches.
+    - case_sensitive (bool): If True, letter case must match. If False, the search is case-insensitive.
+
+    Returns:
+    - list[int]: The indices of the matched headers, in column order.
+    """
+    return list(get_matched_header_indices(tuple(df.columns), reference_string, full_match, case_sensitive))
+
+
+@functools.lru_cache(maxsize=1024)
+def get_matched_header_indices(header_names: tuple, reference_string: str, full_match: bool,
+                               case_sensitive: bool) -> tuple:
+    # Steps search the same header for the same strings again and again, so the matches are cached for each header,
+    # reference string and match type. Headers that are not strings never match
+    if not case_sensitive:
+        reference_string = reference_string.lower()
+    matched_header_indices = []
+    for index, header_name in enumerate(header_names):
+        if not isinstance(header_name, str):
+            continue
+        if not case_sensitive:
+            header_name = header_name.lower()
+        if (header_name == reference_string) if full_match else (reference_string in header_name):
+            matched_header_indices.append(index)
+    return tuple(matched_header_indices)
+
+
 def refactor_string_if_matched(df, string_column, match_column):
     count = 0
 
-    # Get one pattern at a time
-    for _, row_pattern in df.iterrows():
-        pattern = row_pattern.iloc[string_column]
-        for index, row_data in df.iterrows():
-            data = row_data.iloc[match_column]
-            result = data.replace(pattern, "")
-
-            # when data has been updated
-            if result != data:
-                # for debug keep track of number of items changed
-                count += 1
-                # print(f"In row {index} found {pattern} in {data} so changed it to {result}")
-                # replace the data string
-                df.at[index, df.columns[match_column]] = result
+    # Column to update
+    match_label = df.columns[match_column]
+
+    # Work on a plain list of the column strings. Python string methods on a list are faster than going through the
+    # pandas string accessor for every pattern
+    data_list = df[match_label].tolist()
+
+    # Patterns usually repeat a lot. A pattern that did not match any string can only match when the strings changed
+    # since, so keep track of the strings version each pattern last did not match and skip it while unchanged
+    version = 0
+    no_match_version = {}
+
+    # Get one pattern at a time and remove it from all strings
+    for pattern in df.iloc[:, string_column].tolist():
+        if no_match_version.get(pattern) == version:
+            continue
+
+        result_list = [data.replace(pattern, "") if isinstance(data, str) else data for data in data_list]
+
+        # for debug keep track of number of items changed. Only strings change, and NaN never compares equal to itself
+        changed_count = sum(result != data for result, data in zip(result_list, data_list) if isinstance(data, str))
+        count += changed_count
+
+        data_list = result_list
+        if changed_count:
+            version += 1
+        else:
+            no_match_version[pattern] = version
+
+    # replace the data strings
+    df[match_label] = data_list
 
     # message for how many rows changed
     print(f"{count} rows updated")
@@ -67,14 +132,7 @@ def refactor_string_if_matched(df, string_column, match_column):
     return df
 
 
-def delete_columns_with_unwanted_build_data(df: pd.DataFrame, build_dict: dict) -> pd.DataFrame:
-
-    # Get the value associated with the first key
-    first_key = list(build_dict.keys())[0]
-    first_value = build_dict[first_key]
-
-    # Create a list of elements that start at zero and go up to the first build colum
-    columns_to_keep = list(range(0, first_value))
+def get_selected_build_name(build_dict: dict):
     # get the key for the build analyse
     selected_index = 0
     if len(build_dict) > 1:
@@ -95,36 +153,55 @@ def delete_columns_with_unwanted_build_data(df: pd.DataFrame, build_dict: dict)
             except ValueError:
                 print("Invalid input. Please enter a valid number.")
     # Get the selected element
-    selected_key = list(build_dict.keys())[selected_index]
+    return list(build_dict.keys())[selected_index]
+
 
-    start_value = build_dict[selected_key]
+def delete_columns_with_unwanted_build_data(df: pd.DataFrame, build_dict: dict, build_name=None) -> pd.DataFrame:
+
+    # Get the value associated with the first key
+    first_key = list(build_dict.keys())[0]
+    first_value = build_dict[first_key]
+
+    # Create a list of elements that start at zero and go up to the first build colum
+    columns_to_keep = list(range(0, first_value))
+    # prompt user to select a build for analysis, unless the caller already selected one
+    if build_name is None:
+        build_name = get_selected_build_name(build_dict)
+
+    start_value = build_dict[build_name]
     end_value = start_value + 6
     if end_value > len(df.columns):
         end_value = len(df.columns)
     # Generating list with the selected value and the next consecutive five numbers
     columns_to_keep.extend(list(range(start_value, end_value)))
 
-    # Creating a new DataFrame with only the selected columns
-    new_df = df[columns_to_keep]
+    # Creating a new DataFrame with only the selected columns. Build columns are positions, so select by position
+    new_df = df.iloc[:, columns_to_keep]
 
     return new_df
 
 
 def rename_and_reorder_headers(df: pd.DataFrame, item_list: list) -> pd.DataFrame:
 
+    # Rename headers in a list and apply them to the DataFrame once, instead of copying the data for every rename
+    header_list = list(df.columns)
     order_list = []
+    column_index_list = []
     for item in item_list:
         ref = item[0]
         match = item[1]
-        column_index = get_single_header_index(df, ref, match)
+        column_index = get_single_header_index_in_list(header_list, ref, match)
         # New header name
         label = item[2]
-        # Change header name by index
-        df = df.rename(columns={df.columns[column_index]: label})
+        # Change header name, same as rename does for every column with that name
+        old_label = header_list[column_index]
+        header_list = [label if header == old_label else header for header in header_list]
         order_list.append(label)
+        column_index_list.append(column_index)
 
-    # Reorder DataFrame by the provided list and drop remaining columns
-    df = df[order_list]
+    # Reorder DataFrame by the provided list and drop remaining columns. Select the matched columns by position and
+    # set all new header names in one go
+    df = df.iloc[:, column_index_list].set_axis(order_list, axis=1)
 
     return df
 
@@ -1,3 +1,4 @@
+import sys
 
 
 def get_user_selection(options: list, header_msg='Available items',
@@ -33,13 +34,12 @@ def get_user_selection(options: list, header_msg='Available items',
         user_selection = 0
     # when we have multiple options
     else:
+        # Build the list of options available for the user to select once, it is shown again after an invalid input
+        menu = '\n'.join([f'*** {header_msg.upper()} ***'] + [f"[{index}] {key}" for index, key in enumerate(options)])
         while True:
             try:
                 print()
-                print(f'*** {header_msg.upper()} ***')
-                # Print the list of options available for the user to select
-                for index, key in enumerate(options):
-                    print(f"[{index}] {key}")
+                print(menu)
                 # first check user selection as a string
                 user_selection = input(select_msg)
                 # Check if the user wants to exit the application
@@ -74,7 +74,7 @@ def exit_application(msg) -> None:
 
     print('*** WARNING ***')
     print(msg)
-    exit()
+    sys.exit()
 
 
 def main():
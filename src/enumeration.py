@@ -26,3 +26,10 @@ class OutputFileType(Enum):
     def __str__(self):
         return self.value  # So it will return the string representation when used
 
+
+class OutputFileFormat(Enum):
+    XLSX = ".xlsx"  # Excel workbook, for people to review
+    CSV = ".csv"  # Comma separated values, much faster to write and read by other tools
+
+    def __str__(self):
+        return self.value  # So it will return the string representation when used
@@ -1,122 +1,336 @@
 # manage file data
 
 import console
+import functools
 import os
+import zipfile
+from typing import Optional
+from xml.etree import ElementTree
+
 import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ERROR_CODES
+from openpyxl.styles import Alignment, Border, Font, Side
+
+from src.enumeration import OutputFileFormat
+
+# Sheet entries in the workbook part of an Excel file, in transitional and strict Office Open XML
+WORKBOOK_SHEET_TAGS = ('{http://schemas.openxmlformats.org/spreadsheetml/2006/main}sheet',
+                       '{http://purl.oclc.org/ooxml/spreadsheetml/main}sheet')
 
+# Text cell values that 'pd.read_excel' reads as missing values by default
+NA_STRINGS = frozenset(['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                        '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'])
 
-def read_excel_file_data(file_path):
+
+def read_raw_excel_file_data(folder, file):
     """
-    Read an Excel file and return its contents as a DataFrame if the file has only one tab.
-    If the file has multiple tabs, prompt the user to select a tab.
+    Open an Excel file for reading.
+
+    The workbook is opened in read-only mode so sheet data is streamed from the file when a sheet is read,
+    instead of building the full workbook in memory.
 
     Parameters:
-        file_path (str): The full path to the Excel file.
+        folder (str): The full path to the Excel file.
+        file (str): The file name of the Excel file.
 
     Returns:
-        pandas.DataFrame: The DataFrame containing the contents of the selected tab from the Excel file.
+        openpyxl.Workbook: Read-only Excel workbook.
 
     Raises:
-        ValueError: If reading the file fails.
-
-    Example:
-        # Example usage:
-        excel_path = input("Enter the full path to the Excel file: ")
-        data_frame = get_excel_file_data(excel_path)
-        print(data_frame.head())  # Just an example to show the first few rows of the DataFrame
+        FileExistsError: If reading the file fails.
     """
 
     print()
     print('Reading excel file...')
 
+    # build a path to the file
+    file_path = os.path.join(folder, file)
+    # return full path as a raw string
+    file_path = rf"{file_path}"
+
     # Open the Excel file
     try:
-        xls = pd.ExcelFile(file_path, engine='openpyxl')
+        xls = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
     except Exception as e:
         raise FileExistsError(f'Excel file read from "{file_path}" FAILED.', e)
 
     print(f'Read of excel file from "{file_path}" successful.')
 
-    # Check the number of tabs
-    sheet_names = xls.sheet_names
+    return xls
+
+
+def read_user_selected_excel_file_sheet(folder, file, sheet_name: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read the user selected sheet of an Excel file as a DataFrame with no header row.
+
+    Sheet names and sheet data are cached by file path and modification time, so running more than one sequence
+    on the same unchanged file reads it only once. The cached DataFrame is shared, so a copy is returned for the
+    caller to modify.
+
+    Parameters:
+        folder (str): The full path to the Excel file.
+        file (str): The file name of the Excel file.
+        sheet_name (str, optional): The sheet to read. The user is asked to select a sheet when not given.
+
+    Returns:
+        pandas.DataFrame: The user selected sheet data.
+    """
+    # build a path to the file
+    file_path = os.path.join(folder, file)
+    # cached data is only used while the file is not modified
+    modified_time = os.path.getmtime(file_path)
 
     # Get which tab to read
-    header_msg = 'available excel sheets'
-    select_msg = 'Enter the number of the sheet to make a selection'
-    user_selection = console.get_user_selection(sheet_names, header_msg=header_msg, select_msg=select_msg)
-    sheet_name = sheet_names[user_selection]
+    if sheet_name is None:
+        sheet_name = get_user_selected_excel_file_sheet_name(folder, file)
 
     print()
     print(f'Reading sheet... ')
 
     # get tab as dataframe
-    try:
-        df = pd.read_excel(xls, sheet_name, header=None)
-    except Exception as e:
-        raise FileNotFoundError("Excel file read failed.", e)
+    df = read_excel_file_sheet(file_path, modified_time, sheet_name)
 
     print(f'Sheet "{sheet_name}" read successful.')
 
-    return df
+    return df.copy()
 
 
-def read_raw_excel_file_data(folder, file):
+def get_user_selected_excel_file_sheet_name(folder, file) -> str:
     """
-    Read an Excel file and return its contents.
+    Get the user to select a sheet of an Excel file. A file with only one sheet is selected without a prompt.
 
     Parameters:
         folder (str): The full path to the Excel file.
         file (str): The file name of the Excel file.
 
     Returns:
-        Excel file data.
+        str: The selected sheet name.
+    """
+    # build a path to the file
+    file_path = os.path.join(folder, file)
+
+    # get a list of sheet names
+    sheet_names = read_excel_file_sheet_names(file_path, os.path.getmtime(file_path))
+
+    # Get which tab to read
+    header_msg = 'available excel sheets'
+    select_msg = 'Enter the number of the sheet to make a selection'
+    user_selection = console.get_user_selection(sheet_names, header_msg=header_msg, select_msg=select_msg)
+
+    return sheet_names[user_selection]
+
+
+@functools.lru_cache(maxsize=4)
+def read_excel_file_sheet_names(file_path, modified_time) -> list[str]:
+    """
+    Read the sheet names of an Excel file.
+
+    Parameters:
+        file_path (str): The full path to the Excel file.
+        modified_time (float): The file modification time. Only used to key the cache.
+
+    Returns:
+        list[str]: The sheet names. Shared between callers, so it must not be modified.
+    """
+    # Sheet names are listed in the small workbook part of the file. Read only that part so the shared strings and
+    # styles of the whole workbook are not parsed before the user selects a sheet
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+        sheet_names = [sheet.get('name') for tag in WORKBOOK_SHEET_TAGS for sheet in workbook.iter(tag)]
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+        sheet_names = []
+    if sheet_names:
+        return sheet_names
+
+    # Fall back to openpyxl for any file layout not handled above. It also reports files that can not be read
+    folder, file = os.path.split(file_path)
+    xls = read_raw_excel_file_data(folder, file)
+    try:
+        return xls.sheetnames
+    finally:
+        # read-only workbook keeps the file open until it is closed
+        xls.close()
+
+
+def read_excel_file_sheet_top_rows(folder, file, sheet_name, row_count) -> pd.DataFrame:
+    """
+    Read only the top rows of a sheet of an Excel file as a DataFrame with no header row.
+
+    Rows below the top rows are not read, which makes this much faster than reading the whole sheet when only
+    header data is needed.
+
+    Parameters:
+        folder (str): The full path to the Excel file.
+        file (str): The file name of the Excel file.
+        sheet_name (str): The name of the sheet to read.
+        row_count (int): The number of rows to read.
+
+    Returns:
+        pandas.DataFrame: The top rows of the sheet.
 
     Raises:
-        ValueError: If reading the file fails.
+        FileNotFoundError: If reading the sheet fails.
     """
+    xls = read_raw_excel_file_data(folder, file)
+    try:
+        return read_excel_sheet_values(xls[sheet_name], row_count)
+    except Exception as e:
+        raise FileNotFoundError("Excel file read failed.", e)
+    finally:
+        # read-only workbook keeps the file open until it is closed
+        xls.close()
 
-    print()
-    print('Reading excel file...')
 
-    # build a path to the file
-    file_path = os.path.join(folder, file)
-    # return full path as a raw string
-    file_path = rf"{file_path}"
+@functools.lru_cache(maxsize=4)
+def read_excel_file_sheet(file_path, modified_time, sheet_name) -> pd.DataFrame:
+    """
+    Read a sheet of an Excel file as a DataFrame with no header row.
 
-    # Open the Excel file
+    Parameters:
+        file_path (str): The full path to the Excel file.
+        modified_time (float): The file modification time. Only used to key the cache.
+        sheet_name (str): The name of the sheet to read.
+
+    Returns:
+        pandas.DataFrame: The sheet data. Shared between callers, so it must not be modified.
+
+    Raises:
+        FileNotFoundError: If reading the sheet fails.
+    """
+    folder, file = os.path.split(file_path)
+    xls = read_raw_excel_file_data(folder, file)
     try:
-        xls = pd.ExcelFile(file_path, engine='openpyxl')
+        return read_excel_sheet_values(xls[sheet_name])
     except Exception as e:
-        raise FileExistsError(f'Excel file read from "{file_path}" FAILED.', e)
+        raise FileNotFoundError("Excel file read failed.", e)
+    finally:
+        # read-only workbook keeps the file open until it is closed
+        xls.close()
 
-    print(f'Read of excel file from "{file_path}" successful.')
 
-    return xls
+def read_excel_sheet_values(worksheet, max_row: Optional[int] = None) -> pd.DataFrame:
+    """
+    Read all cell values of a worksheet into a DataFrame with no header row.
 
+    Cell values are streamed from a read-only worksheet, which avoids creating a cell object for every cell.
+    The result matches 'pd.read_excel(..., header=None)': empty cells, error cells and missing value text such as
+    'N/A' are NaN, whole number floats are integers, and trailing empty rows and columns are dropped. Unlike
+    'pd.read_excel', a column where every cell is text that looks like a number is kept as text.
 
-def get_user_selected_excel_file_sheet(xls) -> pd.DataFrame:
+    Parameters:
+        worksheet (openpyxl.worksheet.worksheet.Worksheet): The worksheet to read.
+        max_row (int, optional): The last row to read. All rows are read when not given.
 
-    # get a list of sheet names
-    sheet_names = xls.sheet_names
+    Returns:
+        pandas.DataFrame: The worksheet cell values.
+    """
+    # dimensions saved in the file may be wrong, so let openpyxl find them while reading
+    worksheet.reset_dimensions()
+
+    data = []
+    last_row_with_data = -1
+    for row_number, row in enumerate(worksheet.iter_rows(max_row=max_row, values_only=True)):
+        converted_row = []
+        for value in row:
+            if value == "":
+                value = None
+            elif isinstance(value, str) and (value in ERROR_CODES or value in NA_STRINGS):
+                value = float("nan")
+            elif isinstance(value, float) and value.is_integer():
+                value = int(value)
+            converted_row.append(value)
+        # trim trailing empty cells. Empty cells are None until the rows are the same width
+        while converted_row and converted_row[-1] is None:
+            converted_row.pop()
+        if converted_row:
+            last_row_with_data = row_number
+        data.append(converted_row)
+
+    # trim trailing empty rows
+    data = data[:last_row_with_data + 1]
+
+    # an empty worksheet has no data to parse
+    if not data:
+        return pd.DataFrame()
+
+    # extend rows to the same width. Empty cells are NaN, as for 'pd.read_excel'
+    max_width = max(len(data_row) for data_row in data)
+    data = [[float("nan") if value is None else value for value in data_row]
+            + [float("nan")] * (max_width - len(data_row))
+            for data_row in data]
+
+    # the column types are inferred from the values of each column
+    return pd.DataFrame(data)
+
+
+def write_single_sheet_file_data(folder, file, df, file_format=OutputFileFormat.XLSX) -> None:
+    """
+    Write a DataFrame to a file in the requested format.
 
-    # Get which tab to read
-    header_msg = 'available excel sheets'
-    select_msg = 'Enter the number of the sheet to make a selection'
-    user_selection = console.get_user_selection(sheet_names, header_msg=header_msg, select_msg=select_msg)
-    sheet_name = sheet_names[user_selection]
+    Excel is the default as the output is usually reviewed by people, and is the only format the main menu writes.
+    CSV is much faster to write and is the better choice when the output is read by another tool. It is only
+    available to callers of the application sequence functions.
+
+    Parameters:
+        folder (str): The full path to the output folder.
+        file (str): The file name. The file extension is replaced by the one for the file format.
+        df (pandas.DataFrame): The data to write.
+        file_format (OutputFileFormat): The output file format.
+
+    Returns:
+        None
+    """
+    # set the file extension for the file format. This is the only place the extension is set, and it is always lower
+    # case as openpyxl does not write a '.XLSX' file, so the writers do not check it again
+    base_name, _ = os.path.splitext(file)
+    file = base_name + file_format.value
+
+    if file_format == OutputFileFormat.CSV:
+        write_csv_file_data(folder, file, df)
+    else:
+        write_single_sheet_excel_file_data(folder, file, df)
+
+    return None
+
+
+def write_csv_file_data(folder, file, df) -> None:
+    """
+    Write a DataFrame to a CSV file without the DataFrame index.
+
+    The file is UTF-8 with a byte order mark, so Excel shows non-ASCII characters correctly when it opens the file.
+    CSV output is not offered in the main menu. It is used by passing OutputFileFormat.CSV to the application
+    sequence functions.
+
+    Parameters:
+        folder (str): The full path to the output folder.
+        file (str): The file name, including the '.csv' extension.
+        df (pandas.DataFrame): The data to write.
+
+    Returns:
+        None
 
+    Raises:
+        FileExistsError: If writing the file fails.
+    """
     print()
-    print(f'Reading sheet... ')
+    print(f'Writing csv file... ')
+
+    file_path = os.path.join(folder, file)
+    # Good practice to make path OS independent
+    file_path = os.path.normpath(file_path)
 
-    # get tab as dataframe
     try:
-        df = pd.read_excel(xls, sheet_name, header=None)
+        # DataFrame index is not written. Byte order mark lets Excel detect the UTF-8 encoding when the file is opened
+        df.to_csv(file_path, index=False, encoding='utf-8-sig')
     except Exception as e:
-        raise FileNotFoundError("Excel file read failed.", e)
+        raise FileExistsError(f'CSV file write to "{file_path}" FAILED.', e)
 
-    print(f'Sheet "{sheet_name}" read successful.')
+    print(f'Write of csv file to "{file_path}" successful.')
 
-    return df
+    return None
 
 
 def write_single_sheet_excel_file_data(folder, file, df) -> None:
@@ -124,21 +338,29 @@ def write_single_sheet_excel_file_data(folder, file, df) -> None:
     print()
     print(f'Writing excel file... ')
 
-    # Force the file extension to lowercase to avoid case sensitivity issues.
-    # For excel write using 'openpyxl', '.XLSX' does not work and the extention should be '.xlsx'.
-    base_name, ext = os.path.splitext(file)
-    file = base_name + ext.lower()  # Convert the extension to lowercase
-
-    # Ensure that the file extension is '.xlsx' (in lowercase)
-    if not file.endswith('.xlsx'):
-        raise ValueError(f"The file extension is incorrect for {file}. Expected '.xlsx' for excel file write.")
-
     file_path = os.path.join(folder, file)
     # Good practice to make path OS independent
     file_path = os.path.normpath(file_path)
 
     try:
-        df.to_excel(file_path, index=False, engine="openpyxl")  # Set index=False to exclude the DataFrame index from being written
+        # write only workbook streams rows to the file instead of keeping every cell in memory
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title="Sheet1")
+        # header is styled the same way as 'df.to_excel' does it
+        thin = Side(style="thin")
+        header_cells = []
+        for label in df.columns:
+            cell = WriteOnlyCell(ws, value=label)
+            cell.font = Font(bold=True)
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            cell.alignment = Alignment(horizontal="center", vertical="top")
+            header_cells.append(cell)
+        ws.append(header_cells)
+        # DataFrame index is not written. Missing values are written as empty cells
+        values = df.astype(object).where(df.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            ws.append(row)
+        wb.save(file_path)
     except Exception as e:
         raise FileExistsError(f'Excel file write to "{file_path}" FAILED.', e)
 
@@ -1,6 +1,8 @@
 # This file has functions to manipulate both rows and columns in a data frame
-from typing import Type
+import re
+from typing import Optional, Type
 
+import numpy as np
 import pandas as pd
 
 import columns
@@ -29,6 +31,27 @@ boardHdr = "Board"
 # strings to look for when searching for the bom header
 header_search_string_list = [designatorHdr, manufacturerHdr, qtyHdr]
 
+# regular expressions used to clean up column data. Compiled once so repeated calls do not recompile them
+DUPLICATE_COMMAS_REGEX = re.compile(r',{2,}')  # Matches two or more consecutive commas
+DUPLICATE_SPACES_REGEX = re.compile(r' {2,}')  # Matches two or more consecutive space characters
+HORIZONTAL_WHITE_SPACE_REGEX = re.compile(r'[^\S\r\n]+')  # Matches whitespace characters except line breaks
+DESCRIPTION_PUNCTUATION_TABLE = str.maketrans({  # Full width punctuation to half width and semi-colon to comma
+    '，': ',',
+    '（': '(',
+    '）': ')',
+    '；': ',',
+    '：': ':',
+    ';': ',',
+})
+COMMAS_WITH_SPACES_REGEX = re.compile(r' ?,+ ?')  # Matches commas with an optional space before and after
+DESIGNATOR_SEPARATOR_TABLE = str.maketrans(dict.fromkeys(':;、\'，', ','))  # Designator separators to comma
+MANUFACTURER_PREFIX_REGEX = re.compile(r'(?i)^(MANUFACTURER|MANU|MFG)')  # Matches manufacturer label at start
+MANUFACTURER_COMPANY_SUFFIX_REGEX_LIST = [  # Matches ".," as in "Co.,Ltd" with half and full width comma
+    re.compile(r'.,'),
+    re.compile(r'.，'),
+]
+MANUFACTURER_SEPARATOR_TABLE = str.maketrans(dict.fromkeys(':.', ' '))  # Colon and dot to space
+
 cost_walk_header_list_v2 = [itemHdr, designatorHdr, componentHdr, descriptionHdr,
                             manufacturerHdr, partNoHdr, qtyHdr, unitPriceHdr, typeHdr]
 
@@ -294,9 +317,19 @@ def get_output_bom_header_labels(
     return output_bom_header_labels
 
 
-def delete_empty_rows(df: pd.DataFrame) -> pd.DataFrame:
+def get_empty_cell_mask(df: pd.DataFrame) -> np.ndarray:
+    # Compare the cell values as one numpy array instead of going through the pandas operators for each column. Cells
+    # are empty when they are NaN or an empty string
+    values = df.to_numpy(dtype=object)
+    return pd.isna(values) | (values == '')
+
+
+def delete_empty_rows_and_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Delete rows containing either NaN values or empty strings from a pandas DataFrame.
+    Delete rows containing either NaN values or empty strings and count the empty columns of a pandas DataFrame.
+
+    Both are found from one mask of empty cells, so the data is only scanned once. Empty columns are counted but
+    kept as the BOM columns are selected by name and later steps expect all of them.
 
     Parameters:
     df (pandas.DataFrame): The DataFrame from which to delete empty rows.
@@ -307,44 +340,23 @@ def delete_empty_rows(df: pd.DataFrame) -> pd.DataFrame:
 
     # user interface message
     print()
-    print('Deleting empty rows... ')
-
-    # Drop rows with all NaN values
-    mdf = df.dropna(axis=0, how='all')
-
-    # Drop rows with all empty strings
-    mdf = mdf.replace('', pd.NA).dropna(axis=0, how='all')
-
-    rows_before = df.shape[0]
-    rows_after = mdf.shape[0]
-    print(f"Number of rows reduced from {rows_before} to {rows_after}")
-
-    return mdf
+    print('Deleting empty rows and columns... ')
 
+    rows_before, columns_before = df.shape
 
-def delete_empty_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    Delete columns containing either NaN values or empty strings from a pandas DataFrame.
-
-    Parameters:
-    dataframe (pandas.DataFrame): The DataFrame from which to delete empty columns.
-
-    Returns:
-    pandas.DataFrame: DataFrame with columns containing NaN values or empty strings removed.
-    """
-    # message
-    print()
-    print('Deleting empty columns... ')
+    # Find cells with NaN values or empty strings once for both rows and columns
+    is_empty = get_empty_cell_mask(df)
+    is_empty_row = is_empty.all(axis=1)
+    is_empty_column = is_empty[~is_empty_row].all(axis=0)
 
-    # Drop columns with all NaN values
-    mdf = df.dropna(axis=1, how='all')
-
-    # Drop columns with all empty strings
-    mdf = mdf.replace('', pd.NA).dropna(axis=1, how='all')
+    # Drop rows with all NaN values or empty strings. Update the data frame in place so no intermediate copy of the
+    # data is made
+    df.drop(index=df.index[is_empty_row], inplace=True)
 
     # user interface message
-    columns_before = df.shape[1]
-    columns_after = mdf.shape[1]
+    rows_after = df.shape[0]
+    columns_after = columns_before - int(is_empty_column.sum())
+    print(f"Number of rows reduced from {rows_before} to {rows_after}")
     print(f"Number of columns reduced from {columns_before} to {columns_after}")
 
     return df
@@ -356,7 +368,7 @@ def set_bom_column_datatype(df: pd.DataFrame) -> pd.DataFrame:
 
     # panda dataframe places a 'nan' for empty cells. When converted to string we end up with 'nan' string
     # this should be removed and replaced with an empty cell
-    df = df.replace("nan", "")
+    df.replace("nan", "", inplace=True)
 
     # items column data contains numbers. It may be decimal data so convert to float.
     # df[itemHdr] = df[itemHdr].replace("", 0)  # empty cells are treated as zeros
@@ -430,17 +442,23 @@ def split_manufacturers_to_separate_rows(
     # Get the index of the description column
     description_index = columns.get_single_header_index(original_df, 'Description', False)
 
-    # Create an empty data frame with same header
-    updated_df = pd.DataFrame(columns=original_df.columns)
+    # when component name is in exception list we don't split the row. Component types repeat a lot, so the exception
+    # list is matched once for each distinct component type instead of once for each row
+    is_exception_list = rows.get_element_contains_string_mask(original_df, component_index, exception_list)
+
+    # Values for the updated data frame. Each original row is repeated once for every manufacturer it is split into
+    row_count_list = []
+    name_value_list = []
+    part_number_value_list = []
+    description_value_list = []
+    is_alternative_list = []
 
     # read each row on at a time
-    for index, row in original_df.iterrows():
-        # get values we need
-        component_string = row.iloc[component_index]
-        name_string = row.iloc[name_index]
-        description_string = row.iloc[description_index]
-        # part number may be all numbers so force data to string
-        part_number_string = str(row.iloc[part_number_index])
+    for is_exception, name_string, part_number_string, description_string in zip(
+            is_exception_list,
+            original_df.iloc[:, name_index],
+            original_df.iloc[:, part_number_index].astype(str),  # part number may be all numbers so force to string
+            original_df.iloc[:, description_index]):
         name_list = name_string.split('\n')
         part_number_list = part_number_string.split('\n')
         description_list = description_string.split('\n')
@@ -460,33 +478,34 @@ def split_manufacturers_to_separate_rows(
                 print(f"{len(name_list)} Manufacturer names {name_list}")
                 print(f"{len(part_number_list)} Manufacturer part numbers {part_number_list}")
                 print("Please fix the source data file and retry")
-                exit()
-
-        # when component name is exception list we don't split the row
-        split_flag = True
-        for reference_string in exception_list:
-            if reference_string.lower() in component_string.lower():
-                split_flag = False
+                raise ValueError("Number of part numbers does not match number of manufacturers.")
 
         # When we want to split, split the manufacturer names and part numbers into separate rows
-        if not split_flag:
-            updated_df.loc[len(updated_df)] = row
+        if is_exception:
+            row_count_list.append(1)
+            name_value_list.append(name_string)
+            part_number_value_list.append(part_number_string)
+            description_value_list.append(description_string)
+            is_alternative_list.append(False)
         else:
+            row_count_list.append(len(name_list))
             for i in range(len(name_list)):
-                new_row = row.copy()
-                new_row.iloc[name_index] = name_list[i]
-                new_row.iloc[part_number_index] = part_number_list[i]
-                new_row.iloc[description_index] = description_list[i]
-                # Except for first occurrence, all other rows have zero quantity
-                if i != 0:
-                    new_row.iloc[qty_index] = 0
-                # If version 3.0, set price to 0 for all rows except the first
-                if bom_template_version == enum_bom_temp_version.v3 and i != 0:
-                    new_row.iloc[price_index] = 0
-                if bom_template_version == enum_bom_temp_version.v3:
-                    new_row.iloc[description_index] = description_list[i]
-                # add row to updated data frame
-                updated_df.loc[len(updated_df)] = new_row
+                name_value_list.append(name_list[i])
+                part_number_value_list.append(part_number_list[i])
+                description_value_list.append(description_list[i])
+                # Except for first occurrence, all other rows are alternatives
+                is_alternative_list.append(i != 0)
+
+    # repeat each row as many times as it is split and set the split values in one go
+    updated_df = original_df.iloc[np.repeat(np.arange(original_df.shape[0]), row_count_list)].reset_index(drop=True)
+    updated_df.iloc[:, name_index] = name_value_list
+    updated_df.iloc[:, part_number_index] = part_number_value_list
+    updated_df.iloc[:, description_index] = description_value_list
+    # All alternative rows have zero quantity
+    updated_df.iloc[is_alternative_list, qty_index] = 0
+    # If version 3.0, set price to 0 for all alternative rows
+    if bom_template_version == enum_bom_temp_version.v3:
+        updated_df.iloc[is_alternative_list, price_index] = 0
 
     # user interface message
     original_row_count = original_df.shape[0]
@@ -523,12 +542,8 @@ def check_qty_matched_ref_des_count(df):
     print()
     print('Checking quantity matches number of reference designators... ')
 
-    # Get quantity column index
-    quantity_columns = []
-    for index, name in enumerate(list(df.columns)):
-        # Looking for an exact match
-        if "Qty" == name:
-            quantity_columns.append(index)
+    # Get quantity column index. Looking for an exact match
+    quantity_columns = columns.get_header_indices(df, "Qty", True)
     # We only expect one match
     if len(quantity_columns) == 1:
         qty_index = quantity_columns[0]  # Select the first matching column
@@ -540,12 +555,8 @@ def check_qty_matched_ref_des_count(df):
         # Raise an error if no column match
         raise ValueError("No partial match found in the header.")
 
-    # Get reference designator column index
-    designator_columns = []
-    for index, name in enumerate(list(df.columns)):
-        # looking for partial match
-        if "Designator" in name:
-            designator_columns.append(index)
+    # Get reference designator column index. Looking for partial match
+    designator_columns = columns.get_header_indices(df, "Designator", False)
     # We only expect one match
     if len(designator_columns) == 1:
         designator_index = designator_columns[0]  # Select the first matching column
@@ -557,18 +568,17 @@ def check_qty_matched_ref_des_count(df):
         # Raise an error if no partial match is found
         raise ValueError("Designator column not found.")
 
-    # Get one row at a time
-    for _, row in df.iterrows():
-        # get the quantity
-        count_of_quantity = row.iloc[qty_index]
-        # Count the number of reference designators
-        designator_string = row.iloc[designator_index]
-        count_of_designator = len(designator_string.split(','))
-        # raise an error when counts don't match
-        if count_of_designator != count_of_quantity:
-            print(f"Quantity does not match number of designators for item {row.iloc[0]}")
-            print('Fix input data file and try again')
-            exit()
+    # Count the number of reference designators in all rows at once. Designators are comma separated, so the count is
+    # one more than the number of commas
+    count_of_designator = df.iloc[:, designator_index].str.count(',').to_numpy() + 1
+    count_of_quantity = df.iloc[:, qty_index].to_numpy()
+    mismatched = count_of_designator != count_of_quantity
+    # raise an error when counts don't match, naming the first item that does not match
+    if mismatched.any():
+        item = df.iloc[mismatched.argmax(), 0]
+        print(f"Quantity does not match number of designators for item {item}")
+        print('Fix input data file and try again')
+        raise ValueError(f"Quantity does not match number of designators for item {item}.")
 
     # Message
     print(f'Quantity count matches number of reference designators in all {df.shape[0]} rows')
@@ -582,11 +592,7 @@ def normalize_component_type_label(df):
     print('Refactoring component column data... ')
 
     # Get component type column
-    matching_columns = []
-    for index, name in enumerate(list(df.columns)):
-        if "Component" in name:
-            matching_columns.append(index)
-            break  # pick the first one
+    matching_columns = columns.get_header_indices(df, "Component", False)[:1]  # pick the first one
 
     # We only expect one match
     if len(matching_columns) == 1:
@@ -598,43 +604,68 @@ def normalize_component_type_label(df):
     else:
         raise ValueError("No partial match found in the header.")  # Raise an error if no partial match is found
 
-    # Create an empty DataFrame to store the updated rows
-    updated_df = pd.DataFrame(columns=df.columns)
-
-    # Get one row at a time
-    count = 0
-    key_count = 0
-    for _, row in df.iterrows():
-        # Get component type
-        component_type_name = row.iloc[type_index]
+    # Component type labels repeat a lot in a BOM. Use a categorical column so the best match is searched once for
+    # each distinct label instead of once for each row
+    component_types = df.iloc[:, type_index].astype('category')
+
+    # Get all values from the component dict
+    value_list = [value for sublist in component_dict.values() for value in sublist]
+
+    # Labels that already are a known value, in any letter case, do not need the best match search. Both searches
+    # return the first value with the same characters, so only that value can be looked up directly
+    exact_match_dict = {}
+    seen_character_sets = set()
+    for value in value_list:
+        lower_value = value.lower().strip()
+        character_set = frozenset(lower_value)
+        if lower_value and character_set not in seen_character_sets:
+            exact_match_dict[lower_value] = value
+        seen_character_sets.add(character_set)
+
+    # Get the best match for each distinct component type
+    category_match_list = []
+    for component_type_name in component_types.cat.categories:
         # ignore SMD, DIP if found in component type name as they add not value
         component_string = component_type_name.replace("SMD", "").replace("DIP", "").replace("ALT", "").replace("SMT", "")
-        # Get all values from the component dict
-        value_list = [value for sublist in component_dict.values() for value in sublist]
         # Get the best matched value
-        value_match1 = strings.find_best_match_jaccard(component_string, value_list)
-        value_match2 = strings.find_best_match_levenshtein(component_string, value_list)
+        exact_match = exact_match_dict.get(component_string.lower().strip())
+        if exact_match is not None:
+            value_match1 = value_match2 = exact_match
+        else:
+            value_match1 = strings.find_best_match_jaccard(component_string, value_list)
+            value_match2 = strings.find_best_match_levenshtein(component_string, value_list)
         key_match = "*" + component_type_name
         if value_match1 == value_match2:
-            # for debug keep track of number of items changed
-            count += 1
             # Get the key of the matched value
             for key, values in component_dict.items():
                 if value_match1 in values:
                     key_match = key
-                    key_count += 1
-                    # raise exception when multiple keys are found
-                    try:
-                        key_count > 1
-                    except Exception as e:
-                        raise ValueError(f"Multiple component match found for {component_type_name}.", e)
-        # replace the component type name in the row
-        row.iloc[type_index] = key_match
-
-        # add row to updated data frame
-        updated_df.loc[len(updated_df)] = row
-        # debug message
-        print(f'{component_type_name:30} -> {key_match:30} [{value_match1}/{value_match2}]')
+        # debug message is the same for every row with this component type, so format it once
+        debug_message = f'{component_type_name:30} -> {key_match:30} [{value_match1}/{value_match2}]'
+        category_match_list.append((key_match, value_match1 == value_match2, debug_message))
+
+    # Get the matched component type for each row
+    count = 0
+    key_match_list = []
+    debug_message_list = []
+    for code in component_types.cat.codes:
+        # code -1 is an empty cell, which has no category. Keep it empty instead of matching it to a component type
+        if code == -1:
+            key_match_list.append(np.nan)
+            continue
+        key_match, is_matched, debug_message = category_match_list[code]
+        if is_matched:
+            # for debug keep track of number of items changed
+            count += 1
+        key_match_list.append(key_match)
+        debug_message_list.append(debug_message)
+    # debug message. Print all rows at once instead of one print for each row
+    if debug_message_list:
+        print('\n'.join(debug_message_list))
+
+    # replace the component type names. The column stays as plain strings, so later steps can write any value to it
+    updated_df = df.reset_index(drop=True)
+    updated_df.iloc[:, type_index] = key_match_list
 
     # message for how many rows changed
     print(f"{count} rows updated")
@@ -653,18 +684,17 @@ def drop_rows_with_unwanted_ebom_items(df):
     # Get the index of description column
     description_index = columns.get_single_header_index(df, 'Description', True)
 
-    # Remove unwanted description rows
-    updated_df = rows.delete_row_when_element_contains_string(df, description_index, unwanted_description_strings_list)
-
     # List of strings to determine which rows to delete based on string match with component header
     unwanted_component_strings_list = ["PCB", "Wire"]
 
     # Get the index of component column
-    component_index = columns.get_single_header_index(updated_df, 'Component', True)
+    component_index = columns.get_single_header_index(df, 'Component', True)
 
-    # Remove unwanted description rows
-    updated_df = rows.delete_row_when_element_contains_string(updated_df,
-                                                              component_index, unwanted_component_strings_list)
+    # Remove unwanted description and component rows in one pass. Each mask is built from the distinct values of a
+    # categorical column, so the strings are matched once for each distinct label instead of once for each row
+    is_unwanted = rows.get_element_contains_string_mask(df, description_index, unwanted_description_strings_list)
+    is_unwanted |= rows.get_element_contains_string_mask(df, component_index, unwanted_component_strings_list)
+    updated_df = df[~is_unwanted].reset_index(drop=True)
 
     return updated_df
 
@@ -677,9 +707,8 @@ def remove_part_number_from_description(data_frame):
     mdf = strings.strip_match_from_string(data_frame, partNoHdr, descriptionHdr)
 
     # remove duplicate, starting and trailing comma that may be left after part number is removed from description
-    mdf[descriptionHdr] = mdf[descriptionHdr].str.replace(r',{2,}', ',', regex=True) # Do this before strip
-    mdf[descriptionHdr] = mdf[descriptionHdr].str.lstrip(',')
-    mdf[descriptionHdr] = mdf[descriptionHdr].str.rstrip(',')
+    mdf[descriptionHdr] = [DUPLICATE_COMMAS_REGEX.sub(',', value).strip(',') if isinstance(value, str) else value
+                           for value in mdf[descriptionHdr].to_numpy()]  # Remove duplicate commas before strip
 
     print('Done.')
 
@@ -707,10 +736,6 @@ def primary_above_alternative(df: pd.DataFrame,
     print()
     print('Moving primary item above alternative items...')
 
-    # Initialize an empty DataFrame to collect rows (df_temp)
-    df_temp = pd.DataFrame(columns=df.columns)
-    mdf = pd.DataFrame(columns=df.columns)
-
     # Not required for template version 2.0
     if bom_template_version == enum_bom_temp_version.v2:
         mdf = df
@@ -718,36 +743,48 @@ def primary_above_alternative(df: pd.DataFrame,
     # Only needed for template version 3.0
     elif bom_template_version == enum_bom_temp_version.v3:
 
+        # Work on plain lists of row values and build the data frame once at the end
+        designator_index = df.columns.get_loc(designatorHdr)
+        qty_index = df.columns.get_loc(qtyHdr)
+        # Select columns to swap
+        swap_index_list = [df.columns.get_loc(label) for label in [pkgHdr, itemHdr, componentHdr]]
+
+        # Rows of the current part group and rows of all part groups done so far
+        group_rows = []
+        mdf_rows = []
+
         # Read each row one at a time
-        for _, row in df.iterrows():
-            # If df_temp is not empty, check for designator change or empty designatorHdr
-            if (not df_temp.empty and (df_temp[designatorHdr].iloc[0] != row[designatorHdr])) or row[
-                designatorHdr] == "":
-                # Merge current df_temp into mdf
-                mdf = pd.concat([mdf, df_temp], axis=0, ignore_index=True)
-                # Reset df_temp for the next part group
-                df_temp = pd.DataFrame(columns=df.columns)
+        for row in df.itertuples(index=False, name=None):
+            row = list(row)
+            # If group is not empty, check for designator change or empty designator
+            if (group_rows and group_rows[0][designator_index] != row[designator_index]) or \
+                    row[designator_index] == "":
+                # Merge current group into the result
+                mdf_rows.extend(group_rows)
+                # Reset group for the next part group
+                group_rows = []
 
             # If row quantity is non-zero, move it to the top of the current group
-            if row[qtyHdr] != 0:
-                # Add row to the top of df_temp
-                df_temp = pd.concat([pd.DataFrame(row).T, df_temp], axis=0, ignore_index=True)
+            if row[qty_index] != 0:
+                # Add row to the top of the group
+                group_rows.insert(0, row)
 
                 # After adding to the top, check if we have at least two rows to swap
-                if len(df_temp) > 1:
-                    # Select columns to swap
-                    cols_to_swap = [pkgHdr, itemHdr, componentHdr]
-
+                if len(group_rows) > 1:
                     # Swap values between the first and second rows for the selected columns
-                    df_temp.loc[0, cols_to_swap], df_temp.loc[1, cols_to_swap] = \
-                        df_temp.loc[1, cols_to_swap].values, df_temp.loc[0, cols_to_swap].values
+                    for i in swap_index_list:
+                        group_rows[0][i], group_rows[1][i] = group_rows[1][i], group_rows[0][i]
             else:
                 # Move row to the bottom of the current group if quantity is zero
-                df_temp = pd.concat([df_temp, pd.DataFrame(row).T], axis=0, ignore_index=True)
+                group_rows.append(row)
+
+        # After the last group, merge the remaining group into the result
+        mdf_rows.extend(group_rows)
 
-        # After the last group, merge the remaining df_temp into mdf
-        if not df_temp.empty:
-            mdf = pd.concat([mdf, df_temp], axis=0, ignore_index=True)
+        mdf = pd.DataFrame(mdf_rows, columns=df.columns)
+
+    else:
+        mdf = pd.DataFrame(columns=df.columns)
 
     # User interface message
     print("Done")
@@ -793,47 +830,19 @@ def merge_alternative(df_in):
     print()
     print('Merging alternatives items with primary item...')
 
-    # Initialize variables to store previous primary item values
-    prev_desc = ''
-    prev_mfg = ''
-    prev_pn = ''
-    prev_designator = ''
+    # consecutive rows with the same designator are one item. The first row is the primary item
+    designators = df_in[designatorHdr]
+    item_id = (designators != designators.shift()).cumsum()
+    is_primary = item_id != item_id.shift()
 
-    # Create an empty data frame with same header
-    df_out = pd.DataFrame(columns=df_in.columns)
-    df_merger = df_out
+    # keep the primary row of each item
+    df_out = df_in[is_primary].reset_index(drop=True)
 
-    # read each row on at a time
-    for n, row in df_in.iterrows():
-
-        if row[designatorHdr] != prev_designator or n == 0 :
-
-            # first time around no need to concat as there is no data
-            if len(df_merger) != 0:
-                df_out = pd.concat([df_out, pd.DataFrame(df_merger).T], axis=0, ignore_index=True)
-            df_merger = row
-            prev_desc = row[descriptionHdr]
-            prev_mfg = row[manufacturerHdr]
-            prev_pn = row[partNoHdr]
-            prev_designator = row[designatorHdr]
-        else:
-            if row[descriptionHdr]:
-                df_merger[descriptionHdr] += "\n" + row[descriptionHdr]
-            else:
-                df_merger[descriptionHdr] += "\n" + prev_desc
-
-            if row[manufacturerHdr]:
-                df_merger[manufacturerHdr] += "\n" + row[manufacturerHdr]
-            else:
-                df_merger[manufacturerHdr] += "\n" + prev_mfg
-
-            if row[partNoHdr]:
-                df_merger[partNoHdr] += "\n" + row[partNoHdr]
-            else:
-                df_merger[partNoHdr] += "\n" + prev_pn
-
-    # last row merger needs to be done outside the for loop
-    df_out = pd.concat([df_out, pd.DataFrame(df_merger).T], axis=0, ignore_index=True)
+    # merge alternative data into the primary row. Alternatives without data use the primary item data
+    for label in [descriptionHdr, manufacturerHdr, partNoHdr]:
+        primary_values = df_in[label].where(is_primary).ffill()
+        values = df_in[label].where(is_primary | (df_in[label] != ""), primary_values)
+        df_out[label] = values.groupby(item_id, sort=False).agg("\n".join).to_numpy()
 
     # user interface message
     print(f"Number of row in the BOM changed from {df_in.shape[0]} to {df_out.shape[0]}")
@@ -863,16 +872,24 @@ def merge_type_data_with_description(df: pd.DataFrame, bom_template_version: Bom
     return df
 
 
-def select_build(df: pd.DataFrame) -> pd.DataFrame:
+def select_build(df: pd.DataFrame, build_name: Optional[str] = None) -> pd.DataFrame:
     # get all the build names for which data is available in the dataframe
     build_dict = rows.get_build_name_and_column(df)
 
-    # delete column when it has unwanted build data
-    df = columns.delete_columns_with_unwanted_build_data(df, build_dict)
+    # delete column when it has unwanted build data. The user is asked to select a build when none is given
+    df = columns.delete_columns_with_unwanted_build_data(df, build_dict, build_name)
 
     return df
 
 
+def get_selected_build_name(df: pd.DataFrame) -> str:
+    # get all the build names for which data is available in the dataframe
+    build_dict = rows.get_build_name_and_column(df)
+
+    # get user to select a build when there is more than one
+    return columns.get_selected_build_name(build_dict)
+
+
 def split_multiple_quantity(data_frame: pd.DataFrame) -> pd.DataFrame:
     # user interface message
     print()
@@ -908,125 +925,134 @@ def get_bom_columns(df: pd.DataFrame, source_bom_header: list[str]) -> pd.DataFr
     return mdf
 
 
-def cleanup_description(df: pd.DataFrame) -> pd.DataFrame:
-    # user interface message
-    print()
-    print('Cleaning up description column data... ')
-
+def cleanup_description_string(text: str) -> str:
     # remove duplicate spaces
-    df[descriptionHdr] = df[descriptionHdr].str.replace(r'[^\S\r\n]+', ' ', regex=True)
+    text = HORIZONTAL_WHITE_SPACE_REGEX.sub(' ', text)
 
-    # special 'characters' cases...
-    df[descriptionHdr] = df[descriptionHdr].str.replace(r'[，]', ',', regex=True)
-    df[descriptionHdr] = df[descriptionHdr].str.replace(r'[（]', '(', regex=True)
-    df[descriptionHdr] = df[descriptionHdr].str.replace(r'[）]', ')', regex=True)
-    df[descriptionHdr] = df[descriptionHdr].str.replace(r'[；]', ';', regex=True)
-    df[descriptionHdr] = df[descriptionHdr].str.replace(r'[：]', ':', regex=True)
+    # special 'characters' cases and sometimes data is semi-colon separated. One translate does both
+    text = text.translate(DESCRIPTION_PUNCTUATION_TABLE)
 
-    # sometimes data is semi-colon separated
-    df[descriptionHdr] = df[descriptionHdr].str.replace(r'[;]', ',', regex=True)
-
-    # multiple comma, space before and after a comma are replaced by just a comma
-    df[descriptionHdr] = df[descriptionHdr].str.replace(r',{2,}', ',', regex=True)
-    df[descriptionHdr] = df[descriptionHdr].str.replace(r' ,', ',', regex=True)
-    df[descriptionHdr] = df[descriptionHdr].str.replace(r', ', ',', regex=True)
+    # multiple comma, space before and after a comma are replaced by just a comma in one pass
+    text = COMMAS_WITH_SPACES_REGEX.sub(',', text)
 
     # remove starting and trailing comma
-    df[descriptionHdr] = df[descriptionHdr].str.lstrip(',')
-    df[descriptionHdr] = df[descriptionHdr].str.rstrip(',')
+    text = text.strip(',')
 
     # remove starting and trailing space
-    df[descriptionHdr] = df[descriptionHdr].str.lstrip(' ')
-    df[descriptionHdr] = df[descriptionHdr].str.rstrip(' ')
+    text = text.strip(' ')
 
-    print('Done.')
-
-    return df
+    return text
 
 
-def cleanup_designators(df: pd.DataFrame) -> pd.DataFrame:
+def cleanup_description(df: pd.DataFrame) -> pd.DataFrame:
     # user interface message
     print()
-    print('Cleaning up designator column data... ')
+    print('Cleaning up description column data... ')
+
+    # clean up each string with python string methods, which is faster than chaining pandas string methods
+    df[descriptionHdr] = [cleanup_description_string(value) if isinstance(value, str) else value
+                          for value in df[descriptionHdr].to_numpy()]
 
+    print('Done.')
+
+    return df
+
+
+def cleanup_designators_string(text: str) -> str:
     # remove spaces
-    df[designatorHdr] = df[designatorHdr].str.replace(r'\s+', '', regex=True)
+    text = ''.join(text.split())
 
     # replace special characters used to separate designators by comma
-    df[designatorHdr] = df[designatorHdr].str.replace(r'[:;、\'，]', ',', regex=True)
+    text = text.translate(DESIGNATOR_SEPARATOR_TABLE)
 
-    # replace duplicate commas by one comma
-    df[designatorHdr] = df[designatorHdr].str.replace(r',{2,}', ',', regex=True)
+    # replace duplicate commas by one comma and remove starting and trailing comma
+    return ','.join(designator for designator in text.split(',') if designator)
 
-    # remove starting and trailing comma
-    df[designatorHdr] = df[designatorHdr].str.lstrip(',')
-    df[designatorHdr] = df[designatorHdr].str.rstrip(',')
+
+def cleanup_designators(df: pd.DataFrame) -> pd.DataFrame:
+    # user interface message
+    print()
+    print('Cleaning up designator column data... ')
+
+    # clean up each string with python string methods, which is faster than chaining pandas string methods
+    df[designatorHdr] = [cleanup_designators_string(value) if isinstance(value, str) else value
+                         for value in df[designatorHdr].to_numpy()]
 
     print('Done.')
 
     return df
 
 
-def cleanup_manufacturer(df: pd.DataFrame) -> pd.DataFrame:
-    # user interface message
-    print()
-    print('Cleaning up manufacturer column data... ')
-
+def cleanup_manufacturer_string(text: str) -> str:
     # special case when start is with MFG or Manufacturer case-insensitive
-    df[manufacturerHdr] = df[manufacturerHdr].str.replace(r'(?i)^MANUFACTURER', ' ', regex=True)
-    df[manufacturerHdr] = df[manufacturerHdr].str.replace(r'(?i)^MANU', ' ', regex=True)
-    df[manufacturerHdr] = df[manufacturerHdr].str.replace(r'(?i)^MFG', ' ', regex=True)
+    text = MANUFACTURER_PREFIX_REGEX.sub(' ', text)
 
     # replace ".," with space. Special case for "Co.,Ltd" to "Co Ltd"
-    df[manufacturerHdr] = df[manufacturerHdr].str.replace(r'.,', ' ', regex=True)
-    df[manufacturerHdr] = df[manufacturerHdr].str.replace(r'.，', ' ', regex=True)
+    for pattern in MANUFACTURER_COMPANY_SUFFIX_REGEX_LIST:
+        text = pattern.sub(' ', text)
 
     # replace colon and dot with space
-    df[manufacturerHdr] = df[manufacturerHdr].str.replace(r'[:.]', ' ', regex=True)
+    text = text.translate(MANUFACTURER_SEPARATOR_TABLE)
 
     # remove starting and trailing space
-    df[manufacturerHdr] = df[manufacturerHdr].str.lstrip(' ')
-    df[manufacturerHdr] = df[manufacturerHdr].str.rstrip(' ')
+    text = text.strip(' ')
 
     # elements are comma separated
-    df[manufacturerHdr] = df[manufacturerHdr].str.replace(r'\n', ',', regex=True)
+    text = text.replace('\n', ',')
 
     # remove duplicate spaces
-    df[manufacturerHdr] = df[manufacturerHdr].str.replace(r' {2,}', ' ', regex=True)
+    text = DUPLICATE_SPACES_REGEX.sub(' ', text)
     # replace duplicate commas by one comma
-    df[manufacturerHdr] = df[manufacturerHdr].str.replace(r',{2,}', ',', regex=True)
+    text = DUPLICATE_COMMAS_REGEX.sub(',', text)
+
+    return text
+
+
+def cleanup_manufacturer(df: pd.DataFrame) -> pd.DataFrame:
+    # user interface message
+    print()
+    print('Cleaning up manufacturer column data... ')
+
+    # clean up each string with python string methods, which is faster than chaining pandas string methods
+    df[manufacturerHdr] = [cleanup_manufacturer_string(value) if isinstance(value, str) else value
+                           for value in df[manufacturerHdr].to_numpy()]
 
     print('Done.')
 
     return df
 
 
+def cleanup_part_number_string(text: str) -> str:
+    # remove duplicate spaces
+    text = DUPLICATE_SPACES_REGEX.sub(' ', text)
+
+    # elements are comma separated
+    text = text.replace('\n', ',')
+
+    return text
+
+
 def cleanup_part_number(df: pd.DataFrame) -> pd.DataFrame:
     # user interface message
     print()
     print('Cleaning up part number column data... ')
 
-    # remove duplicate spaces
-    df[partNoHdr] = df[partNoHdr].str.replace(r' {2,}', ' ', regex=True)
-
-    # elements are comma separated
-    df[partNoHdr] = df[partNoHdr].str.replace(r'\n', ',', regex=True)
+    # clean up each string with python string methods, which is faster than chaining pandas string methods
+    df[partNoHdr] = [cleanup_part_number_string(value) if isinstance(value, str) else value
+                     for value in df[partNoHdr].to_numpy()]
 
     print('Done.')
 
     return df
 
 
-def drop_unwanted_db_ebom_description(df: pd.DataFrame) -> pd.DataFrame:
+def drop_item_with_zero_quantity(df: pd.DataFrame) -> pd.DataFrame:
     # user interface message
     print()
-    print('Removing unwanted eBOM description items... ')
-
-    # Get the index of description column
-    description_index = columns.get_single_header_index(df, descriptionHdr, True)
+    print('Removing items with zero quantity... ')
 
-    # delete row when the description is prohibited for dB upload
-    mdf = rows.delete_row_when_element_contains_string(df, description_index, unwanted_db_ebom_description_list)
+    # delete row when quantity is zero
+    mdf = rows.delete_row_when_element_zero(df, qtyHdr)
 
     # user interface message
     print(f"Number of rows reduced from {df.shape[0]} to {mdf.shape[0]}")
@@ -1034,16 +1060,29 @@ def drop_unwanted_db_ebom_description(df: pd.DataFrame) -> pd.DataFrame:
     return mdf
 
 
-def drop_unwanted_db_cbom_description(df: pd.DataFrame) -> pd.DataFrame:
+def drop_item_with_quantity_less_than_one(df: pd.DataFrame) -> pd.DataFrame:
+    threshold = 1
+
     # user interface message
     print()
-    print('Removing unwanted cbom description...')
+    print(f'Removing items with quantity less than {threshold}... ')
 
-    # Get the index of description column
-    description_index = columns.get_single_header_index(df, descriptionHdr, True)
+    # delete row when quantity is less than one
+    mdf = rows.delete_row_when_element_less_than_threshold(df, qtyHdr, threshold)
 
-    # delete row when the description is prohibited for dB upload
-    mdf = rows.delete_row_when_element_contains_string(df, description_index, unwanted_db_cbom_description_list)
+    # user interface message
+    print(f"Number of rows reduced from {df.shape[0]} to {mdf.shape[0]}")
+
+    return mdf
+
+
+def drop_items_with_empty_designator(df: pd.DataFrame) -> pd.DataFrame:
+    # user interface message
+    print()
+    print('Removing items with empty designator.... ')
+
+    # delete row when designator is empty
+    mdf = df[df[designatorHdr] != ""]
 
     # user interface message
     print(f"Number of rows reduced from {df.shape[0]} to {mdf.shape[0]}")
@@ -1085,49 +1124,46 @@ def drop_unwanted_db_cbom_component(df: pd.DataFrame) -> pd.DataFrame:
     return mdf
 
 
-def drop_item_with_zero_quantity(df: pd.DataFrame) -> pd.DataFrame:
+def drop_unwanted_db_cbom_items(df: pd.DataFrame) -> pd.DataFrame:
     # user interface message
     print()
-    print('Removing items with zero quantity... ')
-
-    # delete row when quantity is zero
-    mdf = rows.delete_row_when_element_zero(df, qtyHdr)
+    print('Removing unwanted cbom items... ')
 
-    # user interface message
-    print(f"Number of rows reduced from {df.shape[0]} to {mdf.shape[0]}")
-
-    return mdf
+    return drop_unwanted_db_items(df, unwanted_db_cbom_description_list)
 
 
-def drop_item_with_quantity_less_than_one(df: pd.DataFrame) -> pd.DataFrame:
-    threshold = 1
-
+def drop_unwanted_db_ebom_items(df: pd.DataFrame) -> pd.DataFrame:
     # user interface message
     print()
-    print(f'Removing items with quantity less than {threshold}... ')
+    print('Removing unwanted ebom items... ')
 
-    # delete row when quantity is less than one
-    mdf = rows.delete_row_when_element_less_than_threshold(df, qtyHdr, threshold)
+    return drop_unwanted_db_items(df, unwanted_db_ebom_description_list)
 
-    # user interface message
-    print(f"Number of rows reduced from {df.shape[0]} to {mdf.shape[0]}")
 
-    return mdf
+def drop_unwanted_db_items(df: pd.DataFrame, unwanted_description_list: list[str]) -> pd.DataFrame:
+    threshold = 1
 
+    # Get the index of description column
+    description_index = columns.get_single_header_index(df, descriptionHdr, True)
 
-def drop_items_with_empty_designator(df: pd.DataFrame) -> pd.DataFrame:
-    # user interface message
-    print()
-    print('Removing items with empty designator.... ')
+    # build one mask for all conditions so the data is filtered in a single pass.
+    # zero and non-numeric quantity are also less than the threshold.
+    # Unwanted component types are removed by a separate step, as they can only be found once the component type
+    # labels are normalized. These rows are removed first so they are not part of the slow label normalization
+    quantity = pd.to_numeric(df[qtyHdr], errors='coerce')
+    is_wanted = ((df[designatorHdr] != "") & (quantity >= threshold)).to_numpy()
+    # description is prohibited for dB upload
+    is_wanted &= ~rows.get_element_contains_string_mask(df, description_index, unwanted_description_list)
 
-    # delete row when designator is empty
-    mdf = df[df[designatorHdr] != ""]
+    mdf = df[is_wanted].reset_index(drop=True)
 
     # user interface message
+    print(f'Removed items with empty designator, quantity less than {threshold} or unwanted description')
     print(f"Number of rows reduced from {df.shape[0]} to {mdf.shape[0]}")
 
     return mdf
 
+
 def fill_empty_cell_with_data_from_above_cell(df: pd.DataFrame) -> pd.DataFrame:
     # user interface message
     print()
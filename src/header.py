@@ -6,44 +6,28 @@ import pandas as pd
 
 def search_row_matching_header(df: pd.DataFrame, str_list: list) -> int:
 
-    is_header_found = False
-    header_row_idx = -1
-
-    # iterate over rows of the DataFrame
-    for index, row in df.iterrows():
-        # stop search after first header row is found
-        if is_header_found:
-            break
-        else:
-            # reset count of string match
-            count = 0
-        # iterate over each string that needs to be in the header row
-        for element in str_list:
-            # check if the string is partially matched in any cell of the current row
-            if any(row.astype(str).str.contains(element)):
-                count += 1
-                # when all strings are found in a row we stop
-                if count == len(str_list):
-                    header_row_idx = index
-                    is_header_found = True
-                    break
+    # compile the search strings once instead of for every cell of every row
+    pattern_list = [re.compile(element) for element in str_list]
 
-    # If no match is found, raise an error
-    if not is_header_found:
-        header_search_strings = ", ".join(str_list)
-        raise ValueError(f'Header row not found.\nSearching for strings [{header_search_strings}].')
+    # iterate over rows of the DataFrame as plain python values, which is much faster than iterrows
+    for index, row in zip(df.index, df.to_numpy(dtype=object)):
+        cell_strings = [str(cell) for cell in row]
+        # stop search when all strings are partially matched in any cell of the current row
+        if all(any(pattern.search(cell) for cell in cell_strings) for pattern in pattern_list):
+            return index
 
-    return header_row_idx
+    # If no match is found, raise an error
+    header_search_strings = ", ".join(str_list)
+    raise ValueError(f'Header row not found.\nSearching for strings [{header_search_strings}].')
 
 
 def set_top_row_as_header(df: pd.DataFrame) -> pd.DataFrame:
 
     # Extract the top row as header and ensure it is string type
     header = df.iloc[0].astype(str)
-    # Remove the top row and reset index
-    mdf = df.iloc[1:].reset_index(drop=True)
-    # Set the header
-    mdf.columns = header
+    # Remove the top row, set the header and reset index. set_axis returns the new frame directly instead of assigning
+    # the header to the columns of the sliced frame afterward
+    mdf = df.iloc[1:].set_axis(header, axis=1).reset_index(drop=True)
 
     return mdf
 
@@ -10,6 +10,8 @@ Usage:
       to select one of the available options for processing the BOMs.
 """
 
+import multiprocessing
+
 import application
 import console
 import version
@@ -34,7 +36,8 @@ def run_menu() -> bool:
         # list of main menu option
         menu_options = ['Process cBOM for cost walk',
                         'Process cBOM for database upload',
-                        'Process eBOM for database upload']
+                        'Process eBOM for database upload',
+                        'Process all files in input folder']
         # get user to make a selection
         header_msg = 'main menu'
         select_msg = 'Enter the number of the menu option to execute'
@@ -46,6 +49,13 @@ def run_menu() -> bool:
             application.sequence_cbom_for_db_upload()
         elif user_selection == 2:
             application.sequence_ebom_for_db_upload()
+        elif user_selection == 3:
+            # get user to select the process to run for every file
+            header_msg = 'process all files'
+            select_msg = 'Enter the number of the process to run for all files'
+            process_selection = console.get_user_selection(menu_options[:3], header_msg=header_msg,
+                                                           select_msg=select_msg)
+            application.run_sequence_for_all_files(*application.sequence_file_types[process_selection])
         else:
             print("WARNING! Invalid selection. Please select a valid option.")
     except Exception as e:
@@ -92,4 +102,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Batch processing starts worker processes. In a frozen executable, a worker must run its task instead of the
+    # application menu, so this must be called before anything else
+    multiprocessing.freeze_support()
     main()
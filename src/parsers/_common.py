@@ -204,6 +204,32 @@ def extract_cell_value_by_fuzzy_header(row: pd.Series, identifier: str) -> str:
     return DEFAULT_EMPTY_CELL_VALUE
 
 
+def find_column_index_by_fuzzy_header(headers: list, identifier: str) -> int:
+    """
+    Finds the position of the column that `extract_cell_value_by_fuzzy_header` reads for an identifier.
+
+    Column labels are normalized the same way, so reading a row by this position gives the same
+    value as reading the row by fuzzy header. Finding the position once for a table avoids
+    matching the labels again for every row.
+
+    Args:
+        headers (list): The column labels of the BOM table.
+        identifier (str): The expected column header to match against.
+
+    Returns:
+        int: The position of the matching column, or LIST_INDEX_NOT_FOUND (-1) if no match is found.
+    """
+    keys = [normalize_to_string(header) for header in headers]
+    normalized_identifier = _normalize_identifier(identifier)
+
+    for key in keys:
+        if _normalize_identifier(key) == normalized_identifier:
+            # When a label repeats, the row dictionary holds the value of the last column with that label
+            return len(keys) - 1 - keys[::-1].index(key)
+
+    return LIST_INDEX_NOT_FOUND
+
+
 def extract_table_block(df: pd.DataFrame, identifiers: list[str]) -> pd.DataFrame:
     """
     Extracts the BOM component table from a DataFrame using identifier labels to locate the header row.
@@ -266,8 +292,8 @@ def find_row_with_most_identifier_matches(df: pd.DataFrame, identifiers: list[st
     # Normalize each string cell in labels row for consistent label comparison
     normalized_identifiers = [_normalize_identifier(identifier) for identifier in identifiers]
 
-    # Iterate over all the rows in the data frame
-    for index, row in df.iterrows():
+    # Iterate over all the rows in the data frame as plain python values, which is much faster than iterrows
+    for index, row in zip(df.index, df.to_numpy(dtype=object)):
 
         # Start with match count of zero
         match_count = 0
@@ -317,14 +343,15 @@ def find_unmatched_identifiers_in_best_row(df: pd.DataFrame, identifiers: list[s
     # Get best match row as a list
     best_row = df.iloc[best_match_index].astype(str).tolist()
 
-    # Normalize strings for consistent comparison.
-    normalized_row = [_normalize_identifier(cell) for cell in best_row]
+    # Normalize strings for consistent comparison. Use a set so each label is looked up once instead of compared to
+    # every cell
+    normalized_row = {_normalize_identifier(cell) for cell in best_row}
     normalized_identifiers = [_normalize_identifier(identifier) for identifier in identifiers]
 
     # Iterate over all the labels
     for identifier, normalized_identifier in zip(identifiers, normalized_identifiers):
         # When label is not found in the row
-        if not any(normalized_identifier == norm_cell for norm_cell in normalized_row):
+        if normalized_identifier not in normalized_row:
             # Add unmatched label to result list
             unmatched_identifiers.append(identifier)
 
@@ -349,10 +376,9 @@ def flatten_dataframe(df: pd.DataFrame) -> list[str]:
     for header in df.columns:
         flat_list.append(normalize_to_string(header))
 
-    # Include all cell values
-    for _, row in df.iterrows():
-        for cell in row:
-            flat_list.append(normalize_to_string(cell))
+    # Include all cell values, row by row
+    for cell in df.to_numpy(dtype=object).ravel():
+        flat_list.append(normalize_to_string(cell))
 
     return flat_list
 
@@ -36,6 +36,8 @@ License:
  - Internal Use Only
 """
 
+from typing import Sequence
+
 import pandas as pd
 import src.parsers._common as common
 
@@ -126,7 +128,8 @@ def _parse_board_table(sheet_table: pd.DataFrame) -> list[Item]:
     """
     Parses the component table into a list of Item instances.
 
-    Iterates through each row and converts it to a structured Item object.
+    Iterates through each row and converts it to a structured Item object. The column
+    of each label is found once for the table, as all rows share the same header.
 
     Args:
         sheet_table (pd.DataFrame): The component table section of the BOM.
@@ -136,9 +139,12 @@ def _parse_board_table(sheet_table: pd.DataFrame) -> list[Item]:
     """
     items: list[Item] = []
 
-    for _, row in sheet_table.iterrows():
+    column_indices = _find_board_table_column_indices(list(sheet_table.columns))
+
+    # Iterate over rows as plain python values, which is much faster than iterrows
+    for row_values in sheet_table.to_numpy(dtype=object):
         # Convert each row of the table into an Item object
-        item = _parse_board_table_row(row)
+        item = _parse_board_table_values(row_values, column_indices)
         # Append parsed Item to the result list
         items.append(item)
 
@@ -157,11 +163,48 @@ def _parse_board_table_row(row: pd.Series) -> Item:
     Returns:
         Item: The parsed BOM component with mapped field values.
     """
-    item_fields = {}
+    column_indices = _find_board_table_column_indices(list(row.index))
+
+    return _parse_board_table_values(row.to_numpy(dtype=object), column_indices)
+
+
+def _find_board_table_column_indices(headers: list) -> dict[str, int]:
+    """
+    Finds the column position of each Item field using fuzzy label matching.
+
+    Args:
+        headers (list): The column labels of the BOM table.
+
+    Returns:
+        dict[str, int]: Column position for each Item field name, or -1 when the label is not found.
+    """
+    column_indices = {}
 
     for excel_label, model_field in TABLE_LABEL_TO_ATTR_MAP.items():
-        # Extract each field using fuzzy matching against the row headers
-        item_fields[model_field] = common.extract_cell_value_by_fuzzy_header(row, excel_label)
+        column_indices[model_field] = common.find_column_index_by_fuzzy_header(headers, excel_label)
+
+    return column_indices
+
+
+def _parse_board_table_values(row_values: Sequence, column_indices: dict[str, int]) -> Item:
+    """
+    Parses the values of a single component row into an Item instance.
+
+    Args:
+        row_values (Sequence): The cell values of one row of the BOM table, in column order.
+        column_indices (dict[str, int]): Column position for each Item field name, or -1 when not found.
+
+    Returns:
+        Item: The parsed BOM component with mapped field values.
+    """
+    item_fields = {}
+
+    for model_field, column_index in column_indices.items():
+        # Fields without a matching column default to an empty cell value
+        if column_index == common.LIST_INDEX_NOT_FOUND:
+            item_fields[model_field] = common.DEFAULT_EMPTY_CELL_VALUE
+        else:
+            item_fields[model_field] = common.normalize_to_string(row_values[column_index])
 
     return Item(**item_fields)
 
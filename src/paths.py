@@ -1,5 +1,6 @@
 # manage paths to files and folders
 
+import functools
 import os
 import re
 
@@ -20,7 +21,30 @@ def get_path_to_input_file_folder():
         str: Path to the input data folder.
     """
 
-    import os
+    # Build path to input data folder. Based on project folder structure, this will be $project\data\input
+    path = get_path_to_data_folder("inputs")
+
+    # Ensure that the folder exists, if not, create it
+    if not os.path.exists(path):
+        os.makedirs(path)
+
+    return path
+
+
+@functools.lru_cache(maxsize=None)
+def get_path_to_data_folder(folder_name):
+    """
+    Build the path to a folder in the project data folder.
+
+    The path only depends on where this script is located, so it is built once and cached. Callers still check
+    that the folder exists as it may be removed while the application is running.
+
+    Args:
+    - folder_name (str): The name of the folder in the data folder.
+
+    Returns:
+    - str: Path to the folder.
+    """
 
     # Get path to current directory
     path = os.path.dirname(__file__)  # Get the directory of the current script
@@ -28,17 +52,13 @@ def get_path_to_input_file_folder():
     # Split path to get to project folder. Based on project folder structure this is once level above 'src'
     if "src" in path:  # If "src" directory exists in the path
         path = os.path.split(path)[0]  # Move up one level to get to the project folder
-    # Build path to input data folder. Based on project folder structure, this will be $project\data\input
-    path = os.path.join(path, "data")  # Append "data" to the path
-    path = os.path.join(path, "inputs")  # Append "input" to the path
+
+    # Build path to the data folder. Based on project folder structure, this will be $project/data/folder_name
+    path = os.path.join(path, "data", folder_name)
 
     # Good practice to make path OS independent
     path = os.path.normpath(path)  # Normalize the path to ensure consistency across different operating systems
 
-    # Ensure that the folder exists, if not, create it
-    if not os.path.exists(path):
-        os.makedirs(path)
-
     return path
 
 
@@ -89,25 +109,13 @@ def get_path_to_outputs_folder():
         str: Path to the output data folder.
     """
 
-    import os
-
-    # Get path to current directory
-    path = os.path.dirname(__file__)  # Get the directory of the current script
-
-    # Split path to get to project folder. Based on project folder structure this is once level above 'src'
-    if "src" in path:  # If "src" directory exists in the path
-        path = os.path.split(path)[0]  # Move up one level to get to the project folder
-
     # Build path to output data folder. Based on project folder structure, this will be $project/data/outputs
-    path = os.path.join(path, "data", "outputs")
+    path = get_path_to_data_folder("outputs")
 
     # Ensure that the folder exists, if not, create it
     if not os.path.exists(path):
         os.makedirs(path)
 
-    # Good practice to make path OS independent
-    path = os.path.normpath(path)  # Normalize the path to ensure consistency across different operating systems
-
     return path
 
 
@@ -124,14 +132,8 @@ def get_selected_excel_file_name(folder_path):
     Raises:
     - FileNotFoundError: If no Excel files are found in the specified folder.
     """
-    # get the list of files in the folder
-    files = os.listdir(folder_path)
-
-    # filter only Excel files
-    excel_files = [file for file in files if re.match(r'.*\.xlsx$', file, re.IGNORECASE)]
-
-    if not excel_files:
-        raise FileNotFoundError(f'No Excel file found in the folder "{folder_path}"')
+    # get the list of Excel files in the folder
+    excel_files = get_excel_file_names(folder_path)
 
     # get user to make a selection
     header_msg = 'Available Excel files'
@@ -141,3 +143,28 @@ def get_selected_excel_file_name(folder_path):
     selected_file = excel_files[user_selection]
 
     return selected_file
+
+
+def get_excel_file_names(folder_path):
+    """
+    Get the names of all Excel files in the specified folder.
+
+    Args:
+    - folder_path (str): The path to the folder containing the Excel files.
+
+    Returns:
+    - list[str]: The Excel file names.
+
+    Raises:
+    - FileNotFoundError: If no Excel files are found in the specified folder.
+    """
+    # get the list of files in the folder
+    files = os.listdir(folder_path)
+
+    # filter only Excel files
+    excel_files = [file for file in files if re.match(r'.*\.xlsx$', file, re.IGNORECASE)]
+
+    if not excel_files:
+        raise FileNotFoundError(f'No Excel file found in the folder "{folder_path}"')
+
+    return excel_files
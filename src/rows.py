@@ -1,4 +1,8 @@
+import functools
+import re
+
 import strings
+import numpy as np
 import pandas as pd
 
 
@@ -15,38 +19,72 @@ def delete_row_when_element_contains_string(original_df, header_index, reference
         pandas.DataFrame: Updated DataFrame with rows removed based on the specified criteria.
     """
 
-    # Create an empty DataFrame to store the updated rows
-    updated_df = pd.DataFrame(columns=original_df.columns)
-
-    # Get one row at a time
-    for _, row in original_df.iterrows():
-        # Get string to check
-        string_to_check = row.iloc[header_index]
-        # Check if string to check is in the reference string list
-        match = False
-        for reference_string in reference_string_list:
-            # Compare in a case-insensitive manner
-            if reference_string.lower() in string_to_check.lower():
-                match = True
-        # only add row if the string to check is not in the reference string list
-        if not match:
-            updated_df.loc[len(updated_df)] = row
+    # only keep rows where the string to check is not in the reference string list
+    is_match = get_element_contains_string_mask(original_df, header_index, reference_string_list)
+    updated_df = original_df[~is_match].reset_index(drop=True)
 
     return updated_df
 
 
+def get_element_contains_string_mask(df, header_index, reference_string_list):
+    """
+    Find rows that contain any of the specified strings in a given column.
+
+    Args:
+        df (pandas.DataFrame): The DataFrame to check.
+        header_index (int): Index of the column to check for string matches.
+        reference_string_list (list): List of strings to check for in the specified column.
+
+    Returns:
+        numpy.ndarray: Boolean array that is True for each row where the column contains a reference string.
+    """
+
+    # Columns checked here usually have few distinct values. Use a categorical column so each distinct string is
+    # checked once instead of once for each row
+    column = df.iloc[:, header_index].astype('category')
+
+    # Check if each distinct string contains a string in the reference string list. Compare in a case-insensitive
+    # manner using one regular expression for all reference strings
+    reference_regex = get_contains_any_string_regex(tuple(string.lower() for string in reference_string_list))
+    match_list = [reference_regex.search(string_to_check.lower()) is not None
+                  for string_to_check in column.cat.categories]
+    # missing values have category code -1 and are never a match
+    match_list.append(False)
+
+    return np.array(match_list)[column.cat.codes.to_numpy()]
+
+
+@functools.lru_cache(maxsize=None)
+def get_contains_any_string_regex(reference_strings: tuple[str, ...]) -> re.Pattern:
+    """
+    Get a compiled regular expression that matches when any of the reference strings is found in a string.
+
+    The expression is compiled once for each set of reference strings.
+
+    Args:
+        reference_strings (tuple[str, ...]): Strings to search for.
+
+    Returns:
+        re.Pattern: Compiled regular expression. Never matches when there are no reference strings.
+    """
+    if not reference_strings:
+        return re.compile(r'(?!)')
+    return re.compile('|'.join(re.escape(string) for string in reference_strings))
+
+
 def merge_row_data_when_no_found(df, source_column, destination_column):
-    # Create an empty DataFrame to store the updated rows
-    updated_df = pd.DataFrame(columns=df.columns)
+    # Copy of the data with a new row index to store the updated rows
+    updated_df = df.reset_index(drop=True)
 
     # Debug
     debug_count = 0
 
-    # Get one row at a time
-    for index, row in df.iterrows():
+    # Get one row at a time. Zip the two columns instead of using iterrows so no Series is built for each row
+    updated_destination_string_list = []
+    for source_value, destination_value in zip(df.iloc[:, source_column], df.iloc[:, destination_column]):
         # Get source and destination string
-        source_string = str(row.iloc[source_column]).strip()
-        destination_string = str(row.iloc[destination_column]).strip()
+        source_string = str(source_value).strip()
+        destination_string = str(destination_value).strip()
 
         # Normalize the strings to handle numeric discrepancies like 2.0mm vs 2.00mm
         normalized_source = strings.reduce_multiple_trailing_zeros_to_one(source_string.lower())
@@ -59,9 +97,10 @@ def merge_row_data_when_no_found(df, source_column, destination_column):
         else:
             updated_destination_string = destination_string
 
-        # build the updated dataframe
-        row.iloc[destination_column] = updated_destination_string
-        updated_df.loc[len(updated_df)] = row
+        updated_destination_string_list.append(updated_destination_string)
+
+    # build the updated dataframe
+    updated_df.iloc[:, destination_column] = updated_destination_string_list
 
     # message for how many rows changed
     print(f"Description of {debug_count} of {df.shape[0]} rows updated")
@@ -122,40 +161,42 @@ def duplicate_row_for_multiple_quantity(df: pd.DataFrame) -> pd.DataFrame:
     # Quantity column is integer
     df['Qty'] = df['Qty'].astype(float)
 
-    # Create an empty DataFrame to store the updated rows
-    mdf = pd.DataFrame(columns=df.columns)
-
-    for index, old_row in df.iterrows():
-        # only split integers when greater than one.
-        while old_row['Qty'] > 1 and old_row['Qty'] % 1 == 0:
-            ref_des_list = old_row['Designator'].split(',')
-
-            new_row = old_row.copy()
-            new_row['Qty'] = 1
-            new_row['Designator'] = ref_des_list[0]
-
-            old_row['Qty'] -= 1
-            old_row['Designator'] = ','.join(ref_des_list[1:])
-
-            mdf.loc[len(mdf)] = new_row
+    # only split integers when greater than one.
+    quantity = df['Qty'].to_numpy()
+    is_split = (quantity > 1) & (quantity % 1 == 0)
+    # number of rows each row is split into
+    row_count = np.where(is_split, quantity, 1).astype(int)
+
+    # each split row takes one ref des, the last split row keeps the remaining ref des
+    ref_des_list = []
+    for ref_des_string, count, split in zip(df['Designator'], row_count, is_split):
+        if split:
+            ref_des = ref_des_string.split(',')
+            ref_des_list.extend(ref_des[i] if i < len(ref_des) else '' for i in range(count - 1))
+            ref_des_list.append(','.join(ref_des[count - 1:]))
+        else:
+            ref_des_list.append(ref_des_string)
 
-        mdf.loc[len(mdf)] = old_row
+    # repeat each row as many times as it is split and set the split values in one go
+    mdf = df.iloc[np.repeat(np.arange(df.shape[0]), row_count)].reset_index(drop=True)
+    mdf['Designator'] = ref_des_list
+    mdf.loc[np.repeat(is_split, row_count), 'Qty'] = 1
 
     return mdf
 
 
 def standardize_component_name(df: pd.DataFrame, component_dict: dict, component_column: int) -> pd.DataFrame:
 
-    # Create an empty DataFrame to store the updated rows
-    updated_df = pd.DataFrame(columns=df.columns)
+    # Copy of the data with a new row index to store the updated rows
+    updated_df = df.reset_index(drop=True)
 
-    # Get one row at a time
+    # Get the key list
+    keys_list = list(component_dict.keys())
+
+    # Get one row at a time. Only the component column is needed, so no Series is built for each row
     count = 0
-    for _, row in df.iterrows():
-        # Get component type
-        component_type_name = row.iloc[component_column]
-        # Get the key list
-        keys_list = list(component_dict.keys())
+    component_type_name_list = []
+    for component_type_name in df.iloc[:, component_column]:
         # Get the best matched key using different methods
         key_match_1 = strings.find_best_match_jaccard(component_type_name, keys_list)
         key_match_2 = strings.find_best_match_levenshtein(component_type_name, keys_list)
@@ -165,12 +206,14 @@ def standardize_component_name(df: pd.DataFrame, component_dict: dict, component
             # Get the value of the matched key
             value_match = component_dict[key_match_1]
             # replace the component type name in the row
-            row.iloc[component_column] = value_match
+            component_type_name = value_match
             # for debug keep track of number of items changed
             count += 1
 
-        # add row to updated data frame
-        updated_df.loc[len(updated_df)] = row
+        component_type_name_list.append(component_type_name)
+
+    # replace the component type names. Matched values may be lists, so assign them as one object column
+    updated_df.iloc[:, component_column] = pd.Series(component_type_name_list, index=updated_df.index, dtype=object)
 
     # message for how many rows changed
     print(f"{count} rows updated")
@@ -179,20 +222,30 @@ def standardize_component_name(df: pd.DataFrame, component_dict: dict, component
 
 
 def delete_row_when_element_zero(df: pd.DataFrame, column_name: str) -> pd.DataFrame:
-    # Convert the column to numeric if it's not already numeric
-    df[column_name] = pd.to_numeric(df[column_name], errors='coerce')
-
-    # Delete rows with zero values in the specified column
-    mdf = df[df[column_name] != 0]
+    # Convert the column to numeric if it's not already numeric. Quantity is usually float already, so skip the copy
+    if not pd.api.types.is_numeric_dtype(df[column_name]):
+        df[column_name] = pd.to_numeric(df[column_name], errors='coerce')
+
+    # Delete rows with zero values in the specified column. Most rows are usually kept, so skip the copy when no row
+    # is deleted
+    keep = df[column_name].to_numpy() != 0
+    if keep.all():
+        return df
+    mdf = df.iloc[keep]
     return mdf
 
 
 def delete_row_when_element_less_than_threshold(df: pd.DataFrame, column: str, threshold: int) -> pd.DataFrame:
-    # Convert the column to numeric if it's not already numeric
-    df[column] = pd.to_numeric(df[column], errors='coerce')
-
-    # Delete rows with zero values in the specified column
-    mdf = df[df[column] >= threshold]
+    # Convert the column to numeric if it's not already numeric. Quantity is usually float already, so skip the copy
+    if not pd.api.types.is_numeric_dtype(df[column]):
+        df[column] = pd.to_numeric(df[column], errors='coerce')
+
+    # Delete rows with values less than the threshold in the specified column. Most rows are usually kept, so skip the
+    # copy when no row is deleted
+    keep = df[column].to_numpy() >= threshold
+    if keep.all():
+        return df
+    mdf = df.iloc[keep]
     return mdf
 
 
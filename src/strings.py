@@ -1,6 +1,13 @@
+import functools
 import re
+
 import pandas as pd
 
+# regular expressions used across functions. Compiled once so repeated calls do not recompile them
+REF_DES_SEPARATOR_REGEX = re.compile(r'[,:;]')  # Matches characters used to separate reference designators
+REF_DES_NAME_REGEX = re.compile(r'^[A-Za-z].*[A-Za-z0-9]$')  # Matches a valid reference designator name
+NUMERIC_TRAILING_ZEROS_REGEX = re.compile(r'(\.\d*)0+(?=\D*$)')  # Matches trailing zeros in the numeric part
+
 
 def strip_string(df: pd.DataFrame, string: str, column_index: int) -> pd.DataFrame:
     """
@@ -122,45 +129,33 @@ def check_ref_des_name(df: pd.DataFrame) -> pd.DataFrame:
         # Raise an error if no partial match is found
         raise ValueError("No match found for Ref des column.")
 
+    # get reference designator column data as strings. Use a positional index so exploded designators can be
+    # grouped back to the row they came from
+    raw_strings = pd.Series(df.iloc[:, column_index].astype(str).to_numpy())
+    # split reference designator strings to one designator per row, remove leading and trailing whitespace and
+    # make it upper case
+    designators = raw_strings.str.split(REF_DES_SEPARATOR_REGEX, regex=True).explode().str.strip().str.upper()
+    # check all reference designators in one pass over the column
+    is_valid = designators.str.match(REF_DES_NAME_REGEX) | (designators == 'PCB')
+    if not is_valid.all():
+        for row_index, element in designators[~is_valid].items():
+            print(f'Invalid reference designator in row {row_index} = "{element}"')
+        raise ValueError("Invalid reference designator found.")
+    # Convert the designator lists back to comma-separated strings
+    designators = designators.groupby(level=0).agg(','.join)
+
+    # Replace reference designators with reformatted strings
+    df.iloc[:, column_index] = designators.to_numpy()
+
     # Keep track of number of rows for which reference designators were changed
-    rows_changed_count = 0
-
-    # Loop through each row one at a time
-    for i, (_, row) in enumerate(df.iterrows()):
-        # get reference designator column data as a raw_string
-        raw_string = str(row.iloc[column_index])
-        # split reference designator column data raw_string to a list
-        string_list = re.split(r'[,:;]', raw_string)
-        # Iterate through the list and remove leading and trailing whitespace
-        cleaned_list = [x.strip() for x in string_list]
-        # Iterate through the list and make it upper case
-        uppercase_list = [x.upper() for x in cleaned_list]
-        # Reference designator raw_string pattern
-        pattern = r'^[A-Za-z].*[A-Za-z0-9]$'
-        designator_list = []
-        # check each reference designator
-        for element in uppercase_list:
-            if re.match(pattern, element):
-                designator_list.append(element)
-            elif element == 'PCB':
-                designator_list.append(element)
-            else:
-                print(f'Invalid reference designator in row {row} = "{element}"')
-                exit()
-        # Convert the designator list to a comma-separated raw_string
-        designators = ','.join(designator_list)
-
-        # Replace reference designator with reformatted raw_string
-        df.iloc[i, column_index] = designators
-
-        # update number of rows updated count
-        if designators != raw_string:
-            print(f"changed '{raw_string}' to '{designators}'")
-            rows_changed_count += 1
+    is_changed = designators != raw_strings
+    for raw_string, designator_string in zip(raw_strings[is_changed], designators[is_changed]):
+        print(f"changed '{raw_string}' to '{designator_string}'")
+    rows_changed_count = int(is_changed.sum())
 
     # debug message
     print(f'Fixed reference designators in {rows_changed_count} rows')
-    return df  # Moved outside the loop to return after all rows are processed
+    return df
 
 
 def check_duplicate_ref_des(df: pd.DataFrame) -> None:
@@ -193,31 +188,19 @@ def check_duplicate_ref_des(df: pd.DataFrame) -> None:
     else:
         raise ValueError("No match found for Ref des column.")  # Raise an error if no partial match is found
 
-    designator_list = []
-    duplicate_designators = []  # List to store duplicate designators
-
-    # Loop through each row one at a time
-    for index, row in df.iterrows():
-        # get reference designator column data as a string
-        raw_string = str(row.iloc[column_index])
-        # split reference designator column data string to a list using delimiters ',',';',':'
-        string_list = re.split(r'[,:;]', raw_string)
-        # add reference designators to list
-        designator_list.extend(string_list)
-
-    # check for duplicate reference designators
-    seen = set()
-    for item in designator_list:
-        if item in seen:
-            duplicate_designators.append(item)
-        else:
-            seen.add(item)
+    # split reference designator column data strings to one designator per row using delimiters ',',';',':'
+    designators = df.iloc[:, column_index].astype(str).str.split(REF_DES_SEPARATOR_REGEX, regex=True).explode()
+
+    # check for duplicate reference designators in one hash pass. Every occurrence of a duplicate is marked
+    is_duplicate = designators.duplicated(keep=False)
 
-    if duplicate_designators:
+    if is_duplicate.any():
+        # report each duplicate reference designator once
+        duplicate_designators = designators[is_duplicate].unique().tolist()
         print("Duplicates reference designators found:", ', '.join(duplicate_designators))
         print("This application can not determine which ref des is correct")
         print("Please fix the data in the excel file and retry.")
-        exit()
+        raise ValueError("Duplicate reference designators found.")
     else:
         print("No duplicates found.")
 
@@ -249,10 +232,14 @@ def find_best_match_levenshtein(test_string: str, reference_strings: list) -> st
     best_match = "  "
     min_distance = float('inf')  # Start with a distance of positive infinity
 
+    # The test string is the same for every reference string, so prepare it once
+    lower_test_string = test_string.lower().strip()
+
+    # Reference strings are the same lists on every call, so they are lower cased once for each list
+    lower_ref_strings = get_lower_case_reference_strings(tuple(reference_strings))
+
     # Loop through each reference string
-    for ref_string in reference_strings:
-        lower_test_string = test_string.lower().strip()
-        lower_ref_string = ref_string.lower().strip()
+    for ref_string, lower_ref_string in zip(reference_strings, lower_ref_strings):
         # Compute the Levenshtein distance between the test string and the current reference string
         distance = Levenshtein.distance(lower_test_string, lower_ref_string)
         # print(f'L = {distance:2.2f} {test_string:20} {ref_string:20}')
@@ -293,13 +280,17 @@ def find_best_match_jaccard(test_string: str, reference_strings: list) -> str:
     minimum_similarity_threshold = 0.5  # 1.0 is a perfect match. 0.0 is no match
     perfect_match = 1.0
 
+    # The character set of the test string is the same for every reference string, so build it once
+    set1 = set(test_string.lower().strip())
+
+    # Reference strings are the same lists on every call, so their character sets are built once for each list
+    ref_sets = get_reference_character_sets(tuple(reference_strings))
+
     # Iterate through each reference string
-    for ref_string in reference_strings:
+    for ref_string, set2 in zip(reference_strings, ref_sets):
         # Compute Jaccard similarity coefficient
-        set1 = set(test_string.lower().strip())
-        set2 = set(ref_string.lower().strip())
         intersection = len(set1.intersection(set2))
-        union = len(set1.union(set2))
+        union = len(set1) + len(set2) - intersection
         similarity = intersection / union
         # print(f'J = {similarity:2.2f} {test_string:20} {ref_string:20}')
 
@@ -315,6 +306,18 @@ def find_best_match_jaccard(test_string: str, reference_strings: list) -> str:
     return best_match
 
 
+@functools.lru_cache(maxsize=None)
+def get_lower_case_reference_strings(reference_strings: tuple[str, ...]) -> tuple[str, ...]:
+    # Lower case and strip each reference string
+    return tuple(ref_string.lower().strip() for ref_string in reference_strings)
+
+
+@functools.lru_cache(maxsize=None)
+def get_reference_character_sets(reference_strings: tuple[str, ...]) -> tuple[frozenset, ...]:
+    # Set of characters in each lower cased and stripped reference string
+    return tuple(frozenset(ref_string) for ref_string in get_lower_case_reference_strings(reference_strings))
+
+
 def check_consecutive_characters_presence(test_string: str, reference_string: str, consecutive_chars=3) -> bool:
     """
     Checks if at least the specified number of consecutive characters
@@ -362,8 +365,7 @@ def reduce_multiple_trailing_zeros_to_one(numeric_string: str) -> str:
     Returns:
     str: A string where multiple trailing zeros are reduced to one.
     """
-    numeric_normalization_pattern = r'(\.\d*)0+(?=\D*$)'
-    return re.sub(numeric_normalization_pattern, r'\g<1>0', numeric_string)
+    return NUMERIC_TRAILING_ZEROS_REGEX.sub(r'\g<1>0', numeric_string)
 
 def strip_match_from_string(df: pd.DataFrame, pattern_column, search_column) -> pd.DataFrame:
     """
@@ -408,12 +410,12 @@ def strip_match_from_string(df: pd.DataFrame, pattern_column, search_column) ->
     # Keep track of number of cells changed
     count = 0
 
-    # Iterate through each row of the DataFrame
-    for n, row in df.iterrows():
+    # Iterate through each row of the DataFrame. Zip the two columns instead of using iterrows so no Series is built
+    # for each row, and collect the updated strings so the column is written once
+    new_string_list = []
+    for pattern, old_string in zip(df[pattern_column], df[search_column]):
         # Get the pattern string from the specified column
-        pattern = row[pattern_column].strip()  # Remove leading and trailing spaces from the pattern
-        # Get the string from the search column
-        old_string = row[search_column]
+        pattern = pattern.strip()  # Remove leading and trailing spaces from the pattern
 
         # Check if the pattern is found in the search string
         is_found = pattern in old_string
@@ -421,9 +423,15 @@ def strip_match_from_string(df: pd.DataFrame, pattern_column, search_column) ->
         # If the pattern is found, perform replacement
         if is_found:
             new_string = old_string.replace(pattern, '')  # Replace the pattern with an empty string
-            df.at[n, search_column] = new_string  # Update the DataFrame at the current row
             count += 1  # Increment the count of changes
             print(f"\t\tFound '{pattern}' Changed '{old_string}' to '{new_string}'")
+        else:
+            new_string = old_string
+        new_string_list.append(new_string)
+
+    # Update the DataFrame when any string changed
+    if count:
+        df[search_column] = new_string_list
 
     # Print a summary of the number of cells updated
     print(f'\t{count} cells updated.')
@@ -0,0 +1,86 @@
+import contextlib
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+# application modules import each other by module name, as when the application is run from the src folder. The
+# folder is added last, so the "utils" and "parsers" test packages are not hidden by the source packages of that name
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import application  # noqa: E402
+import files  # noqa: E402
+import paths  # noqa: E402
+
+TEST_DATA_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parsers', 'test_data')
+
+
+@unittest.skipUnless(multiprocessing.get_start_method() == 'fork',
+                     'worker processes must inherit the patched input and output folders')
+class TestRunSequenceForAllFiles(unittest.TestCase):
+    def setUp(self):
+        self.input_folder = tempfile.mkdtemp()
+        self.output_folder = tempfile.mkdtemp()
+        # multi sheet workbook and multi build workbook both need the user to make a selection
+        for file_name in ['Version3BomMultiBoard.xlsx', 'IsVersion2BomTemplate.xlsx']:
+            shutil.copy(os.path.join(TEST_DATA_FOLDER, file_name), self.input_folder)
+
+    def tearDown(self):
+        shutil.rmtree(self.input_folder)
+        shutil.rmtree(self.output_folder)
+
+    def test_run_sequence_for_all_files_with_selections(self):
+        print('test_run_sequence_for_all_files_with_selections')
+        # A worker process has no stdin, so input only answers in this process
+        parent_pid = os.getpid()
+
+        def user_input(prompt=''):
+            if os.getpid() != parent_pid:
+                raise EOFError('EOF when reading a line')
+            # second sheet of a multi sheet workbook and first build of a multi build workbook
+            return '1'
+
+        stream = io.StringIO()
+        with mock.patch.object(paths, 'get_path_to_input_file_folder', return_value=self.input_folder), \
+                mock.patch.object(paths, 'get_path_to_outputs_folder', return_value=self.output_folder), \
+                mock.patch('builtins.input', side_effect=user_input), \
+                mock.patch.object(files, 'read_excel_file_sheet', wraps=files.read_excel_file_sheet) as read_sheet, \
+                contextlib.redirect_stdout(stream):
+            application.run_sequence_for_all_files(*application.sequence_file_types[0], max_workers=2)
+
+        output = stream.getvalue()
+        self.assertIn('2 of 2 files processed successfully.', output)
+        self.assertNotIn('EOFError', output)
+        self.assertEqual(sorted(os.listdir(self.output_folder)),
+                         ['CW IsVersion2BomTemplate.xlsx', 'CW Version3BomMultiBoard.xlsx'])
+        # Only the workers read whole sheets, the selections only read the top rows
+        read_sheet.assert_not_called()
+        # Files are shown in sorted order
+        self.assertLess(output.index('*** IsVersion2BomTemplate.xlsx ***'),
+                        output.index('*** Version3BomMultiBoard.xlsx ***'))
+
+
+class TestRunSequence(unittest.TestCase):
+    def test_run_sequence_writes_no_categorical_columns(self):
+        print('test_run_sequence_writes_no_categorical_columns')
+        for source_file_type, output_file_type in application.sequence_file_types:
+            with self.subTest(output_file_type=output_file_type), \
+                    mock.patch.object(paths, 'get_path_to_input_file_folder', return_value=TEST_DATA_FOLDER), \
+                    mock.patch.object(paths, 'get_path_to_outputs_folder', return_value=TEST_DATA_FOLDER), \
+                    mock.patch.object(application.files, 'write_single_sheet_file_data') as write_file, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                application.run_sequence(source_file_type, output_file_type, 'Version3BomSample.xlsx')
+                df = write_file.call_args.args[2]
+                # text columns are written as plain strings, not as categorical columns
+                self.assertFalse([name for name, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)])
+                self.assertEqual(df[application.frames.componentHdr].dtype, object)
+
+
+if __name__ == "__main__":
+    unittest.main()
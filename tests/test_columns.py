@@ -0,0 +1,130 @@
+import unittest
+import pandas as pd
+from src.columns import get_header_indices, get_single_header_index, refactor_string_if_matched, \
+    rename_and_reorder_headers
+
+
+class TestGetSingleHeaderIndex(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(columns=['Item', 'Manufacturer', 'Manufacturer P/N', 'Qty'])
+
+    def test_get_single_header_index_full_match(self):
+        print('test_get_single_header_index_full_match')
+        self.assertEqual(get_single_header_index(self.df, 'manufacturer', True), 1)
+
+    def test_get_single_header_index_partial_match(self):
+        print('test_get_single_header_index_partial_match')
+        self.assertEqual(get_single_header_index(self.df, 'p/n', False), 2)
+
+    def test_get_single_header_index_multiple_match(self):
+        print('test_get_single_header_index_multiple_match')
+        with self.assertRaises(ValueError):
+            get_single_header_index(self.df, 'Manufacturer', False)
+
+    def test_get_single_header_index_no_match(self):
+        print('test_get_single_header_index_no_match')
+        with self.assertRaises(ValueError):
+            get_single_header_index(self.df, 'Designator', True)
+
+
+class TestGetHeaderIndices(unittest.TestCase):
+    def test_get_header_indices_is_case_sensitive(self):
+        print('test_get_header_indices_is_case_sensitive')
+        df = pd.DataFrame(columns=['Item', 'Manufacturer', 'Manufacturer P/N', 'Qty', 'qty'])
+        self.assertEqual(get_header_indices(df, 'Qty', True), [3])
+        self.assertEqual(get_header_indices(df, 'Manufacturer', False), [1, 2])
+        self.assertEqual(get_header_indices(df, 'Designator', False), [])
+
+    def test_get_header_indices_case_insensitive(self):
+        print('test_get_header_indices_case_insensitive')
+        df = pd.DataFrame(columns=['Item', 'Manufacturer', 'Manufacturer P/N', 'Qty', 'qty', 1])
+        self.assertEqual(get_header_indices(df, 'QTY', True, False), [3, 4])
+        self.assertEqual(get_header_indices(df, 'manufacturer', False, False), [1, 2])
+        # repeated search of the same header gives the same result
+        self.assertEqual(get_header_indices(df, 'QTY', True, False), [3, 4])
+
+
+class TestRefactorStringIfMatched(unittest.TestCase):
+    def test_refactor_string_if_matched_removes_all_patterns(self):
+        print('test_refactor_string_if_matched_removes_all_patterns')
+        # Test data
+        self.data = {
+            'pattern':  ['abc',         'xyz',          'def'],
+            'data':     ['abcdef',      '123xyz',       '456']
+        }
+        self.df = pd.DataFrame(self.data)
+        # Call the function
+        result_df = refactor_string_if_matched(self.df.copy(), 0, 1)
+        # Expected result
+        expected_result = {
+            'pattern':  ['abc',         'xyz',          'def'],
+            'data':     ['',            '123',          '456']
+        }
+        expected_df = pd.DataFrame(expected_result)
+        # Check result
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+    def test_refactor_string_if_matched_applies_patterns_in_order(self):
+        print('test_refactor_string_if_matched_applies_patterns_in_order')
+        # Test data
+        self.data = {
+            'pattern':  ['X',           'ab'],
+            'data':     ['aXb',         'abab']
+        }
+        self.df = pd.DataFrame(self.data)
+        # Call the function
+        result_df = refactor_string_if_matched(self.df.copy(), 0, 1)
+        # Expected result. Removing 'X' first creates a new 'ab' match
+        expected_result = {
+            'pattern':  ['X',           'ab'],
+            'data':     ['',            '']
+        }
+        expected_df = pd.DataFrame(expected_result)
+        # Check result
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+    def test_refactor_string_if_matched_repeats_pattern_after_change(self):
+        print('test_refactor_string_if_matched_repeats_pattern_after_change')
+        # Test data
+        self.data = {
+            'pattern':  ['bX',          'bX',           'zz'],
+            'data':     ['bbXX',        'abc',          'zzz']
+        }
+        self.df = pd.DataFrame(self.data)
+        # Call the function
+        result_df = refactor_string_if_matched(self.df.copy(), 0, 1)
+        # Expected result. Removing 'bX' from 'bbXX' leaves a new 'bX' that the repeated pattern removes
+        expected_result = {
+            'pattern':  ['bX',          'bX',           'zz'],
+            'data':     ['',            'abc',          'z']
+        }
+        expected_df = pd.DataFrame(expected_result)
+        # Check result
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+
+class TestRenameAndReorderHeaders(unittest.TestCase):
+    def test_rename_and_reorder_headers(self):
+        print('test_rename_and_reorder_headers')
+        # Test data
+        self.data = {
+            'Qty':          [1,             2],
+            'Unused':       ['a',           'b'],
+            'Mfg P/N':      ['PN1',         'PN2'],
+        }
+        self.df = pd.DataFrame(self.data)
+        # Call the function
+        item_list = [('p/n', False, 'Part Number'), ('QTY', True, 'Quantity')]
+        result_df = rename_and_reorder_headers(self.df.copy(), item_list)
+        # Expected result
+        expected_result = {
+            'Part Number':  ['PN1',         'PN2'],
+            'Quantity':     [1,             2],
+        }
+        expected_df = pd.DataFrame(expected_result)
+        # Check result
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+
+if __name__ == "__main__":
+    unittest.main()
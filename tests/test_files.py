@@ -0,0 +1,177 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date, datetime
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+
+# application modules import each other by module name, as when the application is run from the src folder. The
+# folder is added last, so the "utils" and "parsers" test packages are not hidden by the source packages of that name
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import files  # noqa: E402
+
+TEST_DATA_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parsers', 'test_data')
+
+
+class TestWriteCsvFileData(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_write_csv_file_data_round_trip(self):
+        print('test_write_csv_file_data_round_trip')
+        df = pd.DataFrame({
+            'Item': ['1', '2', '3'],
+            'Description': ['RES 10K, 1%', 'CAP "0.1uF"', 'Résistance'],
+            'Qty': [1.0, 2.5, 10.0],
+        })
+        with redirect_stdout(io.StringIO()):
+            files.write_csv_file_data(self.folder, 'out.csv', df)
+        file_path = os.path.join(self.folder, 'out.csv')
+        # Byte order mark lets Excel detect the encoding
+        with open(file_path, 'rb') as f:
+            self.assertTrue(f.read().startswith(b'\xef\xbb\xbf'))
+        # Index is not written, so reading the file back gives the same frame
+        result = pd.read_csv(file_path, encoding='utf-8-sig', dtype={'Item': str})
+        pd.testing.assert_frame_equal(result, df)
+
+
+class TestWriteSingleSheetExcelFileData(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_write_single_sheet_excel_file_data_round_trip(self):
+        print('test_write_single_sheet_excel_file_data_round_trip')
+        # column order is not alphabetical, so a reordered write is detected
+        df = pd.DataFrame({
+            'Item': ['1', '2', '3'],
+            'Qty': [1.0, 2.5, float('nan')],
+            'Description': ['RES 10K, 1%', '', 'Résistance'],
+            'Designator': ['R1', 'C1, C2', None],
+        })
+        with redirect_stdout(io.StringIO()):
+            files.write_single_sheet_excel_file_data(self.folder, 'out.xlsx', df)
+        file_path = os.path.join(self.folder, 'out.xlsx')
+
+        # header text and column order are kept and the index is not written
+        result = pd.read_excel(file_path, dtype={'Item': str})
+        self.assertEqual(list(result.columns), list(df.columns))
+        # missing values are written as empty cells, so they read back as NaN, as they do for 'df.to_excel'
+        expected_file_path = os.path.join(self.folder, 'expected.xlsx')
+        df.to_excel(expected_file_path, index=False)
+        expected = pd.read_excel(expected_file_path, dtype={'Item': str})
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual(list(result['Description'].iloc[[0, 2]]), ['RES 10K, 1%', 'Résistance'])
+        self.assertEqual(list(result['Qty'].iloc[:2]), [1.0, 2.5])
+
+        # header is bold, as 'df.to_excel' writes it
+        workbook = load_workbook(file_path)
+        try:
+            sheet = workbook.active
+            self.assertEqual(sheet.title, 'Sheet1')
+            self.assertTrue(all(cell.font.bold for cell in sheet[1]))
+        finally:
+            workbook.close()
+
+
+class TestReadExcelSheetValues(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def assert_sheets_match_read_excel(self, file_path):
+        workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            for sheet_name in workbook.sheetnames:
+                with self.subTest(file=os.path.basename(file_path), sheet=sheet_name):
+                    expected = pd.read_excel(file_path, sheet_name, header=None)
+                    result = files.read_excel_sheet_values(workbook[sheet_name])
+                    pd.testing.assert_frame_equal(result, expected)
+        finally:
+            workbook.close()
+
+    def test_read_excel_sheet_values_matches_read_excel_for_sample_workbooks(self):
+        print('test_read_excel_sheet_values_matches_read_excel_for_sample_workbooks')
+        for file_name in sorted(os.listdir(TEST_DATA_FOLDER)):
+            if file_name.endswith('.xlsx'):
+                self.assert_sheets_match_read_excel(os.path.join(TEST_DATA_FOLDER, file_name))
+
+    def test_read_excel_sheet_values_matches_read_excel_for_special_cells(self):
+        print('test_read_excel_sheet_values_matches_read_excel_for_special_cells')
+        workbook = Workbook()
+        sheet = workbook.active
+        # empty first row and column, and empty cells between values
+        sheet['B2'] = 'Item'
+        sheet['C2'] = 'Part Number'
+        sheet['D2'] = 'Date'
+        sheet['E2'] = 'Qty'
+        sheet['F2'] = 'Note'
+        # numeric strings must stay strings
+        sheet['B3'] = '001'
+        sheet['C3'] = '12345'
+        sheet['D3'] = datetime(2024, 1, 31)
+        sheet['E3'] = 2.0
+        sheet['F3'] = '#N/A'
+        sheet['B4'] = 2
+        sheet['C4'] = '1e3'
+        sheet['D4'] = date(2023, 12, 1)
+        sheet['E4'] = 0.5
+        sheet['F4'] = True
+        # merged cells only keep the value of the top left cell
+        sheet['B5'] = 'Merged'
+        sheet.merge_cells('B5:D6')
+        sheet['E6'] = 3
+        # missing value text is read as NaN
+        sheet['F6'] = 'N/A'
+        sheet['F7'] = 'NULL'
+        # empty row and trailing empty row with formatting only
+        sheet['B8'] = 'Last'
+        sheet['G10'].number_format = '0.00'
+        file_path = os.path.join(self.folder, 'special_cells.xlsx')
+        workbook.save(file_path)
+
+        self.assert_sheets_match_read_excel(file_path)
+        # Numeric strings are not converted to numbers
+        workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            result = files.read_excel_sheet_values(workbook.active)
+        finally:
+            workbook.close()
+        self.assertEqual(list(result.iloc[2, 1:3]), ['001', '12345'])
+        self.assertEqual(result.iloc[3, 2], '1e3')
+
+    def test_read_excel_sheet_values_keeps_numeric_text_columns(self):
+        print('test_read_excel_sheet_values_keeps_numeric_text_columns')
+        workbook = Workbook()
+        sheet = workbook.active
+        for row in [['001', 1], ['002', 2.5], [None, 3.0]]:
+            sheet.append(row)
+        file_path = os.path.join(self.folder, 'numeric_text.xlsx')
+        workbook.save(file_path)
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+        try:
+            result = files.read_excel_sheet_values(workbook.active)
+        finally:
+            workbook.close()
+        # Unlike 'pd.read_excel', text that looks like a number is not converted to a number
+        self.assertEqual(list(result[0].iloc[:2]), ['001', '002'])
+        self.assertTrue(pd.isna(result.iloc[2, 0]))
+        self.assertEqual(list(result[1]), [1.0, 2.5, 3.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
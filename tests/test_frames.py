@@ -0,0 +1,44 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+# application modules import each other by module name, as when the application is run from the src folder. The
+# folder is added last, so the "utils" and "parsers" test packages are not hidden by the source packages of that name
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import frames  # noqa: E402
+
+
+class TestNormalizeComponentTypeLabel(unittest.TestCase):
+    def test_normalize_component_type_label_keeps_empty_cells_empty(self):
+        print('test_normalize_component_type_label_keeps_empty_cells_empty')
+        df = pd.DataFrame({
+            'Item': ['1', '2', '3', '4'],
+            'Component': ['Resistor', None, 'Capacitor', 'Resistor'],
+        })
+        with redirect_stdout(io.StringIO()):
+            result = frames.normalize_component_type_label(df)
+        components = list(result['Component'])
+        self.assertEqual(components[0], components[3])
+        self.assertNotEqual(components[0], components[2])
+        # The empty cell must not take the match of another component type
+        self.assertTrue(pd.isna(components[1]))
+
+    def test_normalize_component_type_label_keeps_plain_strings(self):
+        print('test_normalize_component_type_label_keeps_plain_strings')
+        df = pd.DataFrame({
+            'Item': ['1', '2', '3'],
+            'Component': ['Resistor', 'Capacitor', 'Resistor'],
+        })
+        with redirect_stdout(io.StringIO()):
+            result = frames.normalize_component_type_label(df)
+        # Output frames are written as plain string columns, not categorical ones
+        self.assertEqual(result['Component'].dtype, object)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import pandas as pd
-from src.strings import strip_match_from_string
+from src.strings import strip_match_from_string, check_ref_des_name, check_duplicate_ref_des
 
 class TestStripMatchFromString(unittest.TestCase):
     def test_strip_match_from_string_basic_removal(self):
@@ -99,5 +99,62 @@ class TestStripMatchFromString(unittest.TestCase):
         pd.testing.assert_frame_equal(result_df, expected_df)
 
 
+class TestCheckRefDesName(unittest.TestCase):
+    def test_check_ref_des_name_reformat(self):
+        print('test_check_ref_des_name_reformat')
+        # Test data
+        self.data = {
+            'Item':         ['1',           '2',            '3'],
+            'Designator':   ['r1, r2;R3',   'C1:C2',        'PCB']
+        }
+        self.df = pd.DataFrame(self.data)
+        # Call the function
+        result_df = check_ref_des_name(self.df.copy())
+        # Expected result
+        expected_result = {
+            'Item':         ['1',           '2',            '3'],
+            'Designator':   ['R1,R2,R3',    'C1,C2',        'PCB']
+        }
+        expected_df = pd.DataFrame(expected_result)
+        # Check result
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+    def test_check_ref_des_name_invalid_designator(self):
+        print('test_check_ref_des_name_invalid_designator')
+        # Test data
+        self.data = {
+            'Designator':   ['R1,R2',       'C1,1C']
+        }
+        self.df = pd.DataFrame(self.data)
+        # Check result
+        with self.assertRaises(ValueError):
+            check_ref_des_name(self.df.copy())
+
+
+class TestCheckDuplicateRefDes(unittest.TestCase):
+    def test_check_duplicate_ref_des_no_duplicate(self):
+        print('test_check_duplicate_ref_des_no_duplicate')
+        # Test data
+        self.data = {
+            'Designator':   ['R1,R2',       'R3;C1',        'U1']
+        }
+        self.df = pd.DataFrame(self.data)
+        # Call the function
+        result = check_duplicate_ref_des(self.df.copy())
+        # Check result
+        self.assertIsNone(result)
+
+    def test_check_duplicate_ref_des_duplicate(self):
+        print('test_check_duplicate_ref_des_duplicate')
+        # Test data
+        self.data = {
+            'Designator':   ['R1,R2',       'R3:R1',        'U1']
+        }
+        self.df = pd.DataFrame(self.data)
+        # Check result
+        with self.assertRaises(ValueError):
+            check_duplicate_ref_des(self.df.copy())
+
+
 if __name__ == "__main__":
     unittest.main()